@@ -775,13 +775,27 @@ data "archive_file" "api" {
   excludes    = ["**/__pycache__/**", "**/*.pyc"]
 }
 
-# Pillow layer for logo-from-url dimension check (min 100x100)
+# Pillow layer for logo-from-url dimension check (min 100x100); also carries
+# selectolax for generate-description HTML text extraction and orjson for API JSON.
+# Prebuilt cp312 manylinux wheels only (never an sdist compiled on the runner's
+# Python) and no __pycache__, so the layer is smaller and cold starts mmap
+# ready-made extensions. The wheels' .so files ship as built: the vendored
+# *.libs/ objects are patchelf'd by auditwheel and must not be re-stripped.
+# boto3 stays out: the runtime bundles it.
 resource "null_resource" "pillow_layer" {
   triggers = {
     requirements = file("${path.module}/layer_requirements.txt")
+    # Rebuild the zip on every apply (as tools_crt_layer, FUNK-41): CI runners
+    # are fresh, so a skipped provisioner means no zip on disk. The layer
+    # version still only republishes when `requirements` changes.
+    always_run = timestamp()
   }
   provisioner "local-exec" {
-    command     = "mkdir -p build/layer/python/lib/python3.12/site-packages && python3 -m pip install -r ${path.module}/layer_requirements.txt -t build/layer/python/lib/python3.12/site-packages --quiet && cd build/layer && zip -r ../pillow_layer.zip python"
+    command = join(" && ", [
+      "mkdir -p build/layer/python/lib/python3.12/site-packages",
+      "python3 -m pip install -r ${path.module}/layer_requirements.txt -t build/layer/python/lib/python3.12/site-packages --platform manylinux2014_x86_64 --implementation cp --python-version 3.12 --only-binary=:all: --quiet",
+      "cd build/layer && zip -qr ../pillow_layer.zip python -x '*/__pycache__/*'",
+    ])
     working_dir = path.module
   }
 }
@@ -790,7 +804,11 @@ resource "aws_lambda_layer_version" "pillow" {
   filename            = "${path.module}/build/pillow_layer.zip"
   layer_name          = "fus-pillow-layer"
   compatible_runtimes = ["python3.12"]
-  depends_on          = [null_resource.pillow_layer]
+  # Without this a layer_requirements.txt change (selectolax, orjson) rebuilds
+  # the zip but never publishes a new layer version, and the API keeps the old
+  # deps (CLAUDE.md gotcha #2). Hashes the requirements, not the apply-time zip.
+  source_code_hash = base64sha256(null_resource.pillow_layer.triggers.requirements)
+  depends_on       = [null_resource.pillow_layer]
 }
 
 resource "aws_iam_role" "lambdaApi" {
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""One-off backfill of totalStarsSum/totalStarsCount on legacy site METADATA items.
+
+createSite seeds both aggregates and setStar maintains them, so listSites only ever
+reads METADATA. Sites created before that have neither attribute; this script sums
+their STAR# rows once and writes the totals back. Pass --dry-run to only report.
+"""
+import os
+import sys
+
+import boto3
+from botocore.exceptions import ClientError
+
+os.environ.setdefault("TABLE_NAME", "fus-main")
+os.environ.setdefault("AWS_REGION", "us-east-1")
+
+
+def sites_missing_aggregates(dynamodb, table_name):
+    """Yield site PKs whose METADATA lacks totalStarsSum or totalStarsCount."""
+    pages = dynamodb.get_paginator("query").paginate(
+        TableName=table_name,
+        IndexName="byEntity",
+        KeyConditionExpression="entityType = :et",
+        ExpressionAttributeValues={":et": {"S": "SITE"}},
+        ProjectionExpression="PK, totalStarsSum, totalStarsCount",
+    )
+    for page in pages:
+        for item in page.get("Items", []):
+            if "totalStarsSum" not in item or "totalStarsCount" not in item:
+                yield item["PK"]["S"]
+
+
+def star_totals(dynamodb, table_name, site_id):
+    """Return (sum, count) of valid 1-5 ratings across a site's STAR# rows."""
+    total = count = 0
+    pages = dynamodb.get_paginator("query").paginate(
+        TableName=table_name,
+        KeyConditionExpression="PK = :pk AND begins_with(SK, :sk)",
+        ExpressionAttributeValues={":pk": {"S": site_id}, ":sk": {"S": "STAR#"}},
+        ProjectionExpression="rating",
+    )
+    for page in pages:
+        for item in page.get("Items", []):
+            try:
+                rating = int(item["rating"]["N"])
+            except (KeyError, ValueError):
+                continue
+            if 1 <= rating <= 5:
+                total += rating
+                count += 1
+    return total, count
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv[1:]
+    table_name = os.environ["TABLE_NAME"]
+    dynamodb = boto3.client("dynamodb", region_name=os.environ["AWS_REGION"])
+    updated = skipped = 0
+    for site_id in sites_missing_aggregates(dynamodb, table_name):
+        total, count = star_totals(dynamodb, table_name, site_id)
+        print(f"{site_id}: sum={total} count={count}")
+        if dry_run:
+            continue
+        try:
+            # setStar writes both attributes, so a rating that lands mid-backfill wins
+            dynamodb.update_item(
+                TableName=table_name,
+                Key={"PK": {"S": site_id}, "SK": {"S": "METADATA"}},
+                UpdateExpression="SET totalStarsSum = :sum, totalStarsCount = :cnt",
+                ConditionExpression=(
+                    "attribute_exists(PK) AND "
+                    "(attribute_not_exists(totalStarsSum) OR attribute_not_exists(totalStarsCount))"
+                ),
+                ExpressionAttributeValues={":sum": {"N": str(total)}, ":cnt": {"N": str(count)}},
+            )
+            updated += 1
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            skipped += 1
+    print(f"Updated: {updated}, skipped (rated meanwhile): {skipped}" + (" [dry run]" if dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
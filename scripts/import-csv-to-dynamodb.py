@@ -2,7 +2,10 @@
 """Import vehicles fuel expenses from CSV directly to DynamoDB."""
 import csv
 import os
+import re
 import sys
+import time
+from collections import defaultdict
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "lambda"))
 
@@ -12,11 +15,15 @@ os.environ.setdefault("AWS_REGION", "us-east-1")
 # User ID from cleanup output (USER#44087408-3081-70b2-062c-74dc3b313c63)
 USER_ID = "44087408-3081-70b2-062c-74dc3b313c63"
 
+BATCH_SIZE = 25  # BatchWriteItem hard limit
+MAX_BATCH_RETRIES = 8
+
+_CURRENCY_RE = re.compile(r"[$€£¥\s]")
+
 
 def _parse_currency(val: str) -> float:
     """Strip currency symbols and parse number. Handles $65.00, €50, 65,50 (EU) etc."""
-    import re
-    s = re.sub(r"[$€£¥\s]", "", (val or "").strip())
+    s = _CURRENCY_RE.sub("", (val or "").strip())
     if not s:
         return 0.0
     if "." in s:
@@ -29,57 +36,69 @@ def _parse_currency(val: str) -> float:
         return 0.0
 
 
-def _match_column(header: str, patterns: list) -> bool:
-    """Return True if header (lowercased) matches any pattern (substring or exact)."""
-    h = (header or "").lower().strip()
-    if not h:
-        return False
-    for p in patterns:
-        if p in h or h == p:
-            return True
-    return False
+# Header substrings in precedence order; the first hit decides the field.
+_COLUMN_RULES = (
+    ("date", "date"),
+    ("litre", "fuelLitres"),
+    ("liter", "fuelLitres"),
+    ("volume", "fuelLitres"),
+    ("price", "fuelPrice"),
+    ("cost", "fuelPrice"),
+    ("amount", "fuelPrice"),
+    ("odometer", "odometerKm"),
+    ("mileage", "odometerKm"),
+    ("km", "odometerKm"),  # unless it's an l/100km consumption column (see _column_field)
+    ("vehicle", "vehicle"),
+    ("car", "vehicle"),
+)
+
+
+def _column_field(h: str):
+    """Return the import field for a lowercased header, or None."""
+    for sub, field in _COLUMN_RULES:
+        if sub in h and not (sub == "km" and "l/100" in h):
+            return field
+    return None
 
 
 def _build_col_map(headers: list) -> dict:
     """Build map of field -> header key. Columns can be in any order."""
     col_map = {}
-    for i, h in enumerate(headers):
+    for h in headers:
         key = (h or "").strip()
-        if not key:
-            continue
-        if _match_column(key, ["date"]):
-            col_map["date"] = key
-        elif _match_column(key, ["litre", "liter", "volume"]):
-            col_map["fuelLitres"] = key
-        elif _match_column(key, ["price", "cost", "amount"]):
-            col_map["fuelPrice"] = key
-        elif _match_column(key, ["odometer", "mileage"]) or ("km" in key.lower() and "l/100" not in key.lower()):
-            col_map["odometerKm"] = key
-        elif _match_column(key, ["vehicle", "car"]):
-            col_map["vehicle"] = key
+        field = _column_field(key.lower()) if key else None
+        if field:
+            col_map[field] = key
     return col_map
 
 
 def parse_csv(path: str) -> list:
     """Parse CSV into imports format: [{vehicleName, entries: [{date, fuelPrice, fuelLitres, odometerKm}]}].
     Columns can be in any order; detected by header name."""
-    by_vehicle = {}
+    by_vehicle = defaultdict(list)
     with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames or []
+        reader = csv.reader(f)
+        headers = next(reader, [])
         col_map = _build_col_map(headers)
-        date_key = col_map.get("date")
-        price_key = col_map.get("fuelPrice")
-        litres_key = col_map.get("fuelLitres")
-        odo_key = col_map.get("odometerKm")
-        vehicle_key = col_map.get("vehicle")
+        # Positional rows: resolve each detected column to an index once instead
+        # of building a dict per row (csv.DictReader).
+        index_of = {(h or "").strip(): i for i, h in enumerate(headers)}
+        date_idx = index_of.get(col_map.get("date"))
+        price_idx = index_of.get(col_map.get("fuelPrice"))
+        litres_idx = index_of.get(col_map.get("fuelLitres"))
+        odo_idx = index_of.get(col_map.get("odometerKm"))
+        vehicle_idx = index_of.get(col_map.get("vehicle"))
+
+        def cell(row, idx):
+            return row[idx].strip() if idx is not None and idx < len(row) else ""
+
         for row in reader:
-            date_val = (row.get(date_key) or "").strip() if date_key else ""
-            price_val = (row.get(price_key) or "").strip() if price_key else ""
-            litres_val = (row.get(litres_key) or "").strip() if litres_key else ""
-            odo_val = (row.get(odo_key) or "").strip() if odo_key else ""
-            vehicle_val = (row.get(vehicle_key) or "").strip() if vehicle_key else ""
-            if not date_val and not price_val and not litres_val and not odo_val:
+            date_val = cell(row, date_idx)
+            price_val = cell(row, price_idx)
+            litres_val = cell(row, litres_idx)
+            odo_val = cell(row, odo_idx)
+            vehicle_val = cell(row, vehicle_idx)
+            if not (date_val or price_val or litres_val or odo_val):
                 continue
             try:
                 price = _parse_currency(price_val) if price_val else 0
@@ -87,10 +106,7 @@ def parse_csv(path: str) -> list:
                 odo = float(odo_val.replace(",", "")) if odo_val else 0
             except ValueError:
                 continue
-            vehicle_name = vehicle_val or "Vehicle"
-            if vehicle_name not in by_vehicle:
-                by_vehicle[vehicle_name] = []
-            by_vehicle[vehicle_name].append({
+            by_vehicle[vehicle_val or "Vehicle"].append({
                 "date": date_val[:10] if date_val else "",
                 "fuelPrice": price,
                 "fuelLitres": litres,
@@ -99,6 +115,26 @@ def parse_csv(path: str) -> list:
     return [{"vehicleName": k, "entries": v} for k, v in by_vehicle.items() if v]
 
 
+def _batch_write(dynamodb, table_name, items):
+    """BatchWriteItem in chunks of 25; retry UnprocessedItems with exponential backoff.
+    Returns number of items written."""
+    written = 0
+    for i in range(0, len(items), BATCH_SIZE):
+        chunk = items[i:i + BATCH_SIZE]
+        request = {table_name: [{"PutRequest": {"Item": it}} for it in chunk]}
+        for attempt in range(MAX_BATCH_RETRIES):
+            resp = dynamodb.batch_write_item(RequestItems=request)
+            request = resp.get("UnprocessedItems") or {}
+            if not request.get(table_name):
+                break
+            time.sleep(min(2 ** attempt * 0.05, 1.0))
+        unprocessed = len(request.get(table_name) or [])
+        if unprocessed:
+            print(f"Gave up on {unprocessed} unprocessed items")
+        written += len(chunk) - unprocessed
+    return written
+
+
 def main():
     csv_path = "/Users/adam/Downloads/vehicles-fuel-expenses-import.csv"
     if not os.path.exists(csv_path):
@@ -109,11 +145,14 @@ def main():
         print("No valid rows found")
         sys.exit(1)
     print(f"Parsed {len(imports)} vehicles, {sum(len(i['entries']) for i in imports)} total entries")
-    from api.vehicles_expenses import import_fuel_entries
-    result = import_fuel_entries(USER_ID, {"imports": imports})
-    print(f"Created: {result['created']}")
-    if result.get("errors"):
-        print("Errors:", result["errors"])
+    import boto3
+    from api.vehicles_expenses import build_fuel_import_items
+    items, errors = build_fuel_import_items(USER_ID, imports)
+    dynamodb = boto3.client("dynamodb", region_name=os.environ["AWS_REGION"])
+    created = _batch_write(dynamodb, os.environ["TABLE_NAME"], items)
+    print(f"Created: {created}")
+    if errors:
+        print("Errors:", errors)
     print("Done.")
 
 
@@ -12,9 +12,11 @@ import json
 import logging
 import os
 import uuid
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 
 from api import era_client
+from common.dynamodb import DDB_BULK_CLIENT_CONFIG
+from common.timestamps import isoNow
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -46,12 +48,12 @@ def _ddb():
     global _dynamodb
     if _dynamodb is None:
         import boto3
-        _dynamodb = boto3.client("dynamodb")
+        _dynamodb = boto3.client("dynamodb", config=DDB_BULK_CLIENT_CONFIG)
     return _dynamodb
 
 
 def _now():
-    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    return isoNow()
 
 
 def _query_prefix(user_id, sk_prefix):
@@ -9,7 +9,9 @@ Intentionally standalone: no imports from other api modules.
 """
 import logging
 import os
-from datetime import datetime, timezone
+
+from common.dynamodb import DDB_BULK_CLIENT_CONFIG
+from common.timestamps import isoNow
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -21,11 +23,11 @@ MATCH_MODES = ("contains", "starts_with", "equals")
 
 def _ddb():
     import boto3
-    return boto3.client("dynamodb")
+    return boto3.client("dynamodb", config=DDB_BULK_CLIENT_CONFIG)
 
 
 def _now():
-    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    return isoNow()
 
 
 def get_rules(user_id):
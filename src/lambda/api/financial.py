@@ -6,19 +6,38 @@ Shared HTTP JSON fetch, used by investing.py. The Financial dashboard
 """
 import json
 import logging
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+import time
+
+import urllib3
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Yahoo quotes/candles move slower than repeat requests hit a warm container;
+# same per-container URL cache as era_client, bounded by clearing when full.
+CACHE_TTL_SEC = 30
+CACHE_MAX_ENTRIES = 1024
+_cache: dict = {}
+
+# Pooled keep-alive connections: repeat Yahoo calls from a warm container skip the TLS handshake.
+_http = urllib3.PoolManager(num_pools=8, maxsize=16, headers={"User-Agent": "FunkedUpShift/1.0"})
+
 
 def _fetch_json(url, timeout=10):
-    """Fetch URL and return parsed JSON or None."""
+    """Fetch URL and return parsed JSON or None. Successful responses are cached for CACHE_TTL_SEC."""
+    hit = _cache.get(url)
+    if hit and time.time() - hit[0] < CACHE_TTL_SEC:
+        return hit[1]
     try:
-        req = Request(url, headers={"User-Agent": "FunkedUpShift/1.0"})
-        with urlopen(req, timeout=timeout) as resp:
-            return json.loads(resp.read().decode())
-    except (HTTPError, URLError, json.JSONDecodeError, OSError) as e:
+        resp = _http.request("GET", url, timeout=timeout)
+        if resp.status != 200:
+            logger.warning("fetch %s failed: HTTP %s", url[:80], resp.status)
+            return None
+        data = json.loads(resp.data)
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            _cache.clear()
+        _cache[url] = (time.time(), data)
+        return data
+    except (urllib3.exceptions.HTTPError, json.JSONDecodeError, OSError) as e:
         logger.warning("fetch %s failed: %s", url[:80], e)
         return None
@@ -4,45 +4,52 @@ tries about pages first, summarizes via AWS Bedrock Amazon Nova Micro.
 """
 import json
 import logging
-import re
+import os
 import ssl
-import urllib.error
 import urllib.parse
-import urllib.request
-from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import urllib3
+from selectolax.lexbor import LexborHTMLParser
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 MAX_CONTENT_CHARS = 6000
 FETCH_TIMEOUT_SEC = 10
+# Stop waiting on the remaining about-page candidates once one yields this much text
+GOOD_ENOUGH_CHARS = 500
+# extract_text keeps MAX_CONTENT_CHARS of text; no need to pull multi-MB pages to find it
+MAX_HTML_BYTES = 512 * 1024
 BEDROCK_MODEL_ID = "amazon.nova-micro-v1:0"
 
+_bedrock = None
 
-class TextExtractor(HTMLParser):
-    """Extract visible text from HTML, skipping script/style."""
-
-    def __init__(self):
-        super().__init__()
-        self.text_parts = []
-        self.skip = False
-
-    def handle_starttag(self, tag, attrs):
-        if tag.lower() in ("script", "style", "noscript"):
-            self.skip = True
-
-    def handle_endtag(self, tag):
-        if tag.lower() in ("script", "style", "noscript"):
-            self.skip = False
 
-    def handle_data(self, data):
-        if not self.skip and data:
-            cleaned = data.strip()
-            if cleaned:
-                self.text_parts.append(cleaned)
-
-    def get_text(self):
-        return " ".join(self.text_parts)
+def _bedrockClient():
+    """Cached Bedrock runtime client."""
+    global _bedrock
+    if _bedrock is None:
+        import boto3
+        _bedrock = boto3.client("bedrock-runtime", region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    return _bedrock
+
+
+# Trust store is loaded once per container, not once per candidate URL.
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = True
+_SSL_CTX.verify_mode = ssl.CERT_REQUIRED
+# Keep-alive pool: about-page candidates share a host, so one TLS handshake serves them all.
+_http = urllib3.PoolManager(
+    num_pools=8,
+    maxsize=16,
+    ssl_context=_SSL_CTX,
+    headers={
+        "User-Agent": "Mozilla/5.0 (compatible; Funkedupshift/1.0; +https://github.com)",
+        "Accept-Encoding": "gzip, deflate",
+    },
+    retries=urllib3.Retry(total=5, connect=0, read=0),  # follow redirects only, as urlopen did
+)
 
 
 def fetch_html(url):
@@ -53,25 +60,17 @@ def fetch_html(url):
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; Funkedupshift/1.0; +https://github.com)"},
-            method="GET",
-        )
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = True
-        ctx.verify_mode = ssl.CERT_REQUIRED
-        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT_SEC, context=ctx) as resp:
+        resp = _http.request("GET", url, timeout=FETCH_TIMEOUT_SEC, preload_content=False)
+        try:
             if resp.status != 200:
-                return None, f"HTTP {resp.status}"
-            try:
-                raw = resp.read()
-                return raw.decode("utf-8", errors="replace"), None
-            except Exception as e:
-                return None, str(e)
-    except urllib.error.HTTPError as e:
-        return None, f"HTTP {e.code}: {e.reason}"
-    except urllib.error.URLError as e:
+                return None, f"HTTP {resp.status}: {resp.reason}"
+            raw = resp.read(MAX_HTML_BYTES)  # decompressed by urllib3 when gzip/deflate
+        finally:
+            # A capped read can leave body unread; close so the connection isn't pooled half-consumed.
+            resp.close()
+            resp.release_conn()
+        return raw.decode("utf-8", errors="replace"), None
+    except urllib3.exceptions.MaxRetryError as e:
         return None, str(e.reason) if e.reason else str(e)
     except Exception as e:
         logger.exception("fetch_html error: %s", e)
@@ -79,21 +78,15 @@ def fetch_html(url):
 
 
 def extract_text(html):
-    """Extract main text from HTML. Prefer main, article, body."""
+    """Extract visible text from HTML, skipping script/style/noscript."""
     if not html or not html.strip():
         return ""
-    parser = TextExtractor()
-    try:
-        parser.feed(html)
-        text = parser.get_text()
-    except Exception:
-        text = ""
-    if not text:
-        text = re.sub(r"<script[^>]*>[\s\S]*?</script>", "", html, flags=re.IGNORECASE)
-        text = re.sub(r"<style[^>]*>[\s\S]*?</style>", "", text, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = re.sub(r"\s+", " ", text).strip()
-    return text[:MAX_CONTENT_CHARS]
+    tree = LexborHTMLParser(html)
+    for node in tree.css("script, style, noscript"):
+        node.decompose()
+    root = tree.body or tree.root
+    text = root.text(separator=" ", strip=True) if root else ""
+    return " ".join(text.split())[:MAX_CONTENT_CHARS]
 
 
 def try_about_pages(base_url):
@@ -117,16 +110,29 @@ def try_about_pages(base_url):
 
     best_text = ""
     best_url = base
+    best_rank = len(candidates)
 
-    for candidate in candidates:
-        html, err = fetch_html(candidate)
-        if err:
-            logger.info("fetch %s failed: %s", candidate, err)
-            continue
-        text = extract_text(html)
-        if len(text) > len(best_text) and len(text) > 50:
-            best_text = text
-            best_url = candidate
+    # Fetch all candidates concurrently; wall time is the slowest fetch, not the sum.
+    # Ties on length go to the earlier candidate, matching the old sequential order.
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    try:
+        futures = {executor.submit(fetch_html, c): rank for rank, c in enumerate(candidates)}
+        for fut in as_completed(futures):
+            rank = futures[fut]
+            candidate = candidates[rank]
+            html, err = fut.result()
+            if err:
+                logger.info("fetch %s failed: %s", candidate, err)
+                continue
+            text = extract_text(html)
+            if len(text) <= 50:
+                continue
+            if len(text) > len(best_text) or (len(text) == len(best_text) and rank < best_rank):
+                best_text, best_url, best_rank = text, candidate, rank
+            if len(best_text) >= GOOD_ENOUGH_CHARS:
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return best_text, best_url
 
@@ -145,12 +151,7 @@ Content:
 Write only the summary, no preamble."""
 
     try:
-        import boto3
-
-        region = __import__("os").environ.get("AWS_REGION", "us-east-1")
-        client = boto3.client("bedrock-runtime", region_name=region)
-
-        response = client.converse(
+        response = _bedrockClient().converse(
             modelId=BEDROCK_MODEL_ID,
             messages=[
                 {"role": "user", "content": [{"text": prompt}]}
@@ -10,6 +10,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 
+from common.timestamps import isoNow
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
@@ -58,9 +60,8 @@ def save_dashboard_sites(sites):
         return False
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb")
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         dynamodb.put_item(
             TableName=TABLE_NAME,
             Item={
@@ -270,9 +271,8 @@ def _save_to_dynamodb(sites):
         return
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb")
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         dynamodb.put_item(
             TableName=TABLE_NAME,
             Item={
@@ -6,9 +6,12 @@ import json
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 
 from api.financial import _fetch_json
+from common.dynamodb import DDB_BULK_CLIENT_CONFIG
+from common.timestamps import isoNow
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -19,6 +22,17 @@ BEDROCK_MODEL_ID = "amazon.nova-micro-v1:0"
 VALID_RANGES = ["1mo", "3mo", "6mo", "1y", "2y", "5y", "max"]
 VALID_INTERVALS = ["1d", "1wk", "1mo"]
 
+_dynamodb = None
+
+
+def _ddb():
+    """Cached DynamoDB client."""
+    global _dynamodb
+    if _dynamodb is None:
+        import boto3
+        _dynamodb = boto3.client("dynamodb", config=DDB_BULK_CLIENT_CONFIG)
+    return _dynamodb
+
 
 def search_symbols(query):
     """Yahoo symbol search. Returns [{symbol, name, exchange, exchDisp, quoteType}]."""
@@ -211,9 +225,15 @@ def suggest_tickers(query):
         f"No prose, no explanation.\n\nRequest: {query}"
     )
     text = _converse(prompt, max_tokens=256)
+    symbols = _parse_ticker_array(text)
+    if not symbols:
+        return []
+    # One Yahoo search per symbol; run them concurrently (map keeps model order)
+    with ThreadPoolExecutor(max_workers=len(symbols)) as ex:
+        searches = list(ex.map(search_symbols, symbols))
     validated = []
-    for sym in _parse_ticker_array(text):
-        for hit in search_symbols(sym):
+    for sym, hits in zip(symbols, searches):
+        for hit in hits:
             if hit["symbol"].upper() == sym:
                 validated.append(hit)
                 break
@@ -255,9 +275,7 @@ def get_tracker(user_id):
     if not TABLE_NAME or not user_id:
         return []
     try:
-        import boto3
-        dynamodb = boto3.client("dynamodb")
-        resp = dynamodb.get_item(
+        resp = _ddb().get_item(
             TableName=TABLE_NAME,
             Key={"PK": {"S": f"USER#{user_id}"}, "SK": {"S": "INVESTING#TRACKER"}},
             ProjectionExpression="symbols",
@@ -276,12 +294,9 @@ def save_tracker(user_id, symbols):
     if not TABLE_NAME or not user_id:
         return False
     try:
-        import boto3
-        from datetime import datetime, timezone
-        dynamodb = boto3.client("dynamodb")
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         symbols_clean = [str(s).strip().upper() for s in symbols if str(s).strip()]
-        dynamodb.put_item(
+        _ddb().put_item(
             TableName=TABLE_NAME,
             Item={
                 "PK": {"S": f"USER#{user_id}"},
@@ -9,7 +9,9 @@ import re
 import urllib.error
 import urllib.parse
 import urllib.request
-from datetime import datetime, timezone
+
+from common.dynamodb import DDB_CLIENT_CONFIG
+from common.timestamps import isoNow
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -22,14 +24,34 @@ VALID_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
 MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
 FETCH_TIMEOUT_SEC = 10
 
+_dynamodb = None
+_s3Client = None
+
+
+def _ddb():
+    """Cached DynamoDB client, reused across warm invocations."""
+    global _dynamodb
+    if _dynamodb is None:
+        import boto3
+        _dynamodb = boto3.client("dynamodb", config=DDB_CLIENT_CONFIG)
+    return _dynamodb
+
+
+def _s3():
+    """Cached S3 client (presigned URLs, meme images)."""
+    global _s3Client
+    if _s3Client is None:
+        import boto3
+        _s3Client = boto3.client("s3", region_name=os.environ.get("AWS_REGION", "us-east-1"))
+    return _s3Client
+
 
 def _get_user_custom_groups(user_id):
     """Fetch user's custom group memberships from DynamoDB."""
     if not TABLE_NAME or not user_id:
         return []
     try:
-        import boto3
-        dynamodb = boto3.client("dynamodb")
+        dynamodb = _ddb()
         pk = f"USER#{user_id}"
         result = dynamodb.query(
             TableName=TABLE_NAME,
@@ -110,9 +132,7 @@ def _add_meme_urls(meme_list, region=None):
     if not MEDIA_BUCKET or not meme_list:
         return
     try:
-        import boto3
-        region = region or os.environ.get("AWS_REGION", "us-east-1")
-        s3 = boto3.client("s3", region_name=region)
+        s3 = _s3()
         for m in meme_list:
             for key_attr, url_attr in [("mediaKey", "mediaUrl"), ("thumbnailKey", "thumbnailUrl")]:
                 key = m.get(key_attr)
@@ -200,9 +220,8 @@ def list_memes(event, user, json_response):
     if not TABLE_NAME:
         return json_response({"memes": [], "error": "TABLE_NAME not set"}, 200)
     try:
-        import boto3
         region = os.environ.get("AWS_REGION", "us-east-1")
-        dynamodb = boto3.client("dynamodb", region_name=region)
+        dynamodb = _ddb()
         qs = event.get("queryStringParameters") or {}
         user_id = (user or {}).get("userId")
         user_groups = (user or {}).get("groups", [])
@@ -306,8 +325,7 @@ def list_meme_tags(event, json_response):
     if not TABLE_NAME:
         return json_response({"tags": []}, 200)
     try:
-        import boto3
-        dynamodb = boto3.client("dynamodb")
+        dynamodb = _ddb()
         resp = dynamodb.get_item(
             TableName=TABLE_NAME,
             Key={"PK": {"S": "MEME_TAGS#REGISTRY"}, "SK": {"S": "METADATA"}},
@@ -337,7 +355,7 @@ def _ensure_tags_in_registry(dynamodb, new_tags):
     if "Item" in resp and "tags" in resp["Item"]:
         existing = [v.get("S", "") for v in resp["Item"]["tags"].get("L", [])]
     combined = sorted(set(existing) | set(new_tags))
-    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    now = isoNow()
     dynamodb.put_item(
         TableName=TABLE_NAME,
         Item={
@@ -360,7 +378,7 @@ def _update_meme_cache(dynamodb, meme_id):
         ids = [v.get("S", "") for v in resp["Item"]["memeIds"].get("L", [])]
     ids = [meme_id] + [i for i in ids if i != meme_id]
     ids = ids[:MEME_CACHE_MAX]
-    now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    now = isoNow()
     dynamodb.put_item(
         TableName=TABLE_NAME,
         Item={
@@ -384,10 +402,9 @@ def create_meme(event, user, json_response):
     if not media_key:
         return json_response({"error": "mediaKey is required"}, 400)
     try:
-        import boto3
         import uuid as uuid_mod
         meme_id = f"MEME#{uuid_mod.uuid4()}"
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         user_id = user["userId"]
         title = (body.get("title") or "").strip() or generate_meme_title()
         description = (body.get("description") or "").strip() or ""
@@ -398,7 +415,7 @@ def create_meme(event, user, json_response):
         if size_mode not in ("original", "resize"):
             size_mode = "resize"
 
-        dynamodb = boto3.client("dynamodb")
+        dynamodb = _ddb()
         item = {
             "PK": {"S": meme_id},
             "SK": {"S": "METADATA"},
@@ -432,12 +449,11 @@ def update_meme(event, user, json_response):
     if not TABLE_NAME:
         return json_response({"error": "TABLE_NAME not set"}, 500)
     try:
-        import boto3
         body = json.loads(event.get("body", "{}"))
         meme_id = (body.get("id") or "").strip()
         if not meme_id or not meme_id.startswith("MEME#"):
             return json_response({"error": "id is required"}, 400)
-        dynamodb = boto3.client("dynamodb")
+        dynamodb = _ddb()
         resp = dynamodb.get_item(
             TableName=TABLE_NAME,
             Key={"PK": {"S": meme_id}, "SK": {"S": "METADATA"}},
@@ -451,7 +467,7 @@ def update_meme(event, user, json_response):
         if not can_edit:
             return json_response({"error": "Forbidden: cannot edit this meme"}, 403)
 
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         set_parts = ["updatedAt = :now"]
         names = {}
         values = {":now": {"S": now}}
@@ -499,8 +515,7 @@ def delete_meme(event, user, json_response):
         meme_id = (body.get("id") or "").strip()
         if not meme_id:
             return json_response({"error": "id is required"}, 400)
-        import boto3
-        dynamodb = boto3.client("dynamodb")
+        dynamodb = _ddb()
         resp = dynamodb.get_item(
             TableName=TABLE_NAME,
             Key={"PK": {"S": meme_id}, "SK": {"S": "METADATA"}},
@@ -521,7 +536,7 @@ def delete_meme(event, user, json_response):
             media_key = resp["Item"].get("mediaKey", {}).get("S", "")
             if media_key:
                 try:
-                    s3 = boto3.client("s3")
+                    s3 = _s3()
                     s3.delete_object(Bucket=MEDIA_BUCKET, Key=media_key)
                 except Exception as e:
                     logger.warning("S3 delete meme media failed: %s", e)
@@ -536,7 +551,6 @@ def get_meme_presigned_upload(event, user, json_response):
     if not MEDIA_BUCKET:
         return json_response({"error": "MEDIA_BUCKET not configured"}, 500)
     try:
-        import boto3
         import uuid as uuid_mod
         body = json.loads(event.get("body", "{}"))
         meme_id = (body.get("memeId") or body.get("id") or "").strip() or f"MEME#{uuid_mod.uuid4()}"
@@ -555,8 +569,7 @@ def get_meme_presigned_upload(event, user, json_response):
         user_id = user.get("userId", "unknown")
         safe_user = re.sub(r"[^a-zA-Z0-9_-]", "_", user_id)[:64]
         key = f"memes/{safe_user}/{meme_id.replace('#', '_')}_{uuid_mod.uuid4()}.{ext}"
-        region = os.environ.get("AWS_REGION", "us-east-1")
-        s3 = boto3.client("s3", region_name=region)
+        s3 = _s3()
         upload_url = s3.generate_presigned_url(
             "put_object",
             Params={"Bucket": MEDIA_BUCKET, "Key": key, "ContentType": content_type},
@@ -587,7 +600,6 @@ def import_meme_from_url(event, user, json_response):
     if not MEDIA_BUCKET:
         return json_response({"error": "MEDIA_BUCKET not configured"}, 500)
     try:
-        import boto3
         import uuid as uuid_mod
         import re
         body = json.loads(event.get("body", "{}"))
@@ -616,8 +628,7 @@ def import_meme_from_url(event, user, json_response):
         safe_user = re.sub(r"[^a-zA-Z0-9_-]", "_", user_id)[:64]
         meme_id = f"MEME#{uuid_mod.uuid4()}"
         key = f"memes/{safe_user}/{meme_id.replace('#', '_')}.{ext}"
-        region = os.environ.get("AWS_REGION", "us-east-1")
-        s3 = boto3.client("s3", region_name=region)
+        s3 = _s3()
         s3.put_object(Bucket=MEDIA_BUCKET, Key=key, Body=data, ContentType=content_type)
         presigned_url = s3.generate_presigned_url(
             "get_object",
@@ -651,9 +662,7 @@ def set_meme_star(event, user, json_response):
         rating = int(rating)
         user_id = user.get("userId", "")
         star_sk = f"STAR#{user_id}"
-        import boto3
-        region = os.environ.get("AWS_REGION", "us-east-1")
-        dynamodb = boto3.client("dynamodb", region_name=region)
+        dynamodb = _ddb()
         dynamodb.put_item(
             TableName=TABLE_NAME,
             Item={
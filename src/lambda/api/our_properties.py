@@ -7,6 +7,9 @@ import logging
 import os
 from urllib.parse import urlparse, quote
 
+from common.ratings import clampedAverage
+from common.timestamps import isoNow
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
@@ -211,9 +214,8 @@ def save_our_properties_sites(sites):
         return False
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb")
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         to_save = []
         for s in sites:
             if isinstance(s, dict):
@@ -379,11 +381,7 @@ def _score_site(item):
         return None
     if c_val <= 0:
         return None
-    avg = s_val / c_val
-    if avg < 1.0:
-        avg = 1.0
-    if avg > 5.0:
-        avg = 5.0
+    avg = clampedAverage(s_val, c_val)
     title = (item.get("title", {}).get("S", "") or "").strip()
     desc = (item.get("description", {}).get("S", "") or "").strip()[:255]
     logo_key = (item.get("logoKey", {}).get("S", "") or "").strip() or None
@@ -409,11 +407,7 @@ def _score_media(item):
         return None
     if c_val <= 0:
         return None
-    avg = s_val / c_val
-    if avg < 1.0:
-        avg = 1.0
-    if avg > 5.0:
-        avg = 5.0
+    avg = clampedAverage(s_val, c_val)
     title = (item.get("title", {}).get("S", "") or "").strip()
     desc = (item.get("description", {}).get("S", "") or "").strip()[:255]
     thumb_key = (item.get("thumbnailKey", {}).get("S", "") or "").strip() or None
@@ -538,9 +532,8 @@ def save_highest_rated_sites(sites):
         return False
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb")
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         to_save = []
         for s in sites:
             if not isinstance(s, dict):
@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+import time
 import boto3
 from common.response import jsonResponse
 from api.handler import getUserInfo
@@ -28,10 +29,10 @@ def getAdminStats(event):
         dynamodb = boto3.resource("dynamodb")
         table = dynamodb.Table(TABLE_NAME)
         
-        import datetime
-        # Try today then yesterday
-        today = datetime.datetime.utcnow().strftime("%Y-%m-%d")
-        yesterday = (datetime.datetime.utcnow() - datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+        # Try today then yesterday (UTC)
+        now = time.time()
+        today = time.strftime("%Y-%m-%d", time.gmtime(now))
+        yesterday = time.strftime("%Y-%m-%d", time.gmtime(now - 86400))
         
         for date_str in [today, yesterday]:
             resp = table.get_item(
@@ -52,11 +53,10 @@ def postAdminStatsRecompute(event):
         return err
     
     try:
-        import datetime
         # Recompute *today* (UTC) so the admin sees traffic they just generated;
         # the nightly cron still handles yesterday. Without a date the collector
         # defaults to yesterday (FUNK-62).
-        today = datetime.datetime.utcnow().strftime("%Y-%m-%d")
+        today = time.strftime("%Y-%m-%d", time.gmtime())
         lambda_client = boto3.client("lambda")
         collector_fn = os.environ.get("COLLECTOR_FUNCTION_NAME", "fus-collector")
         lambda_client.invoke(
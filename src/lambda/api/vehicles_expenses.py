@@ -9,7 +9,8 @@ import io
 import re
 import uuid
 import zipfile
-from datetime import datetime, timezone
+
+from common.timestamps import isoNow
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -136,10 +137,9 @@ def create_vehicle(user_id, data):
         return None
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
         vehicle_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         item = _build_item(data, now, now)
         dynamodb.put_item(
             TableName=TABLE_NAME,
@@ -168,9 +168,8 @@ def update_vehicle(user_id, vehicle_id, data):
         return None
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         merged = {**existing, **data, "updatedAt": now}
         item = _build_item(merged, existing.get("createdAt", now), now)
         dynamodb.put_item(
@@ -284,10 +283,9 @@ def create_fuel_entry(user_id, vehicle_id, data):
         return None
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
         fillup_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         item = _build_fuel_item(data, now, now)
         dynamodb.put_item(
             TableName=TABLE_NAME,
@@ -316,9 +314,8 @@ def update_fuel_entry(user_id, vehicle_id, fillup_id, data):
         return None
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         merged = {**existing, **data, "updatedAt": now}
         item = _build_fuel_item(merged, existing.get("createdAt", now), now)
         dynamodb.put_item(
@@ -443,14 +440,13 @@ def _ensure_maintenance_vendor(user_id, vendor):
         return
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
         existing = list_maintenance_vendors(user_id, "")
         exists = any(v.lower() == normalized.lower() for v in existing)
         if exists:
             return
         combined = [*existing, normalized]
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         dynamodb.put_item(
             TableName=TABLE_NAME,
             Item={
@@ -495,11 +491,10 @@ def _ensure_maintenance_tags(user_id, tags):
         return
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
         existing = list_maintenance_tags(user_id, "")
         combined = _normalize_maintenance_tags([*existing, *normalized])
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         dynamodb.put_item(
             TableName=TABLE_NAME,
             Item={
@@ -576,10 +571,9 @@ def create_maintenance_entry(user_id, vehicle_id, data):
         return None
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
         maintenance_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         item = _build_maintenance_item(data, now, now)
         dynamodb.put_item(
             TableName=TABLE_NAME,
@@ -621,9 +615,8 @@ def update_maintenance_entry(user_id, vehicle_id, maintenance_id, data):
         return None
     try:
         import boto3
-        from datetime import datetime, timezone
         dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
-        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        now = isoNow()
         merged = {**existing, **data, "updatedAt": now}
         merged["tags"] = _normalize_maintenance_tags(merged.get("tags") or [])
         merged["vendor"] = _normalize_maintenance_vendor(merged.get("vendor"))
@@ -696,6 +689,60 @@ def get_maintenance_attachment_upload(user_id, vehicle_id, filename, content_typ
         return None
 
 
+def _resolve_import_vehicle(user_id, imp, vehicles_by_name, errors):
+    """Return (vehicle_name, vehicle_id) for one import, creating the vehicle by name; None on error."""
+    vehicle_name = (imp.get("vehicleName") or "").strip()
+    entries = imp.get("entries") or []
+    if not vehicle_name:
+        errors.append("Missing vehicleName in import")
+        return None
+    if not isinstance(entries, list):
+        errors.append(f"Invalid entries for {vehicle_name}")
+        return None
+    vehicle_id = vehicles_by_name.get(vehicle_name)
+    if not vehicle_id:
+        new_vehicle = create_vehicle(user_id, {"name": vehicle_name})
+        if not new_vehicle:
+            errors.append(f"Failed to create vehicle {vehicle_name}")
+            return None
+        vehicle_id = vehicles_by_name[vehicle_name] = new_vehicle["id"]
+    return vehicle_name, vehicle_id
+
+
+def _import_entry_data(entry, vehicle_name, errors):
+    """Normalize one import entry (Excel serial dates, numeric fields); None to skip it."""
+    if not isinstance(entry, dict):
+        return None
+    date_val = entry.get("date")
+    fuel_price = entry.get("fuelPrice")
+    fuel_litres = entry.get("fuelLitres")
+    odometer = entry.get("odometerKm")
+    if date_val is None and fuel_price is None and fuel_litres is None and odometer is None:
+        return None
+    if isinstance(date_val, (int, float)) and date_val > 0:
+        try:
+            from datetime import datetime as dt, timedelta
+            excel_epoch = dt(1899, 12, 30)
+            date_val = (excel_epoch + timedelta(days=float(date_val))).strftime("%Y-%m-%d")
+        except Exception:
+            date_val = str(date_val)[:10]
+    elif date_val is not None:
+        date_val = str(date_val)[:10]
+    try:
+        fuel_price = float(fuel_price) if fuel_price is not None else 0
+        fuel_litres = float(fuel_litres) if fuel_litres is not None else 0
+        odometer = float(odometer) if odometer is not None else 0
+    except (TypeError, ValueError):
+        errors.append(f"Invalid numbers in entry for {vehicle_name}: {entry}")
+        return None
+    return {
+        "date": date_val or "",
+        "fuelPrice": fuel_price,
+        "fuelLitres": fuel_litres,
+        "odometerKm": odometer,
+    }
+
+
 def import_fuel_entries(user_id, payload):
     """
     Import fuel entries from Excel data.
@@ -710,60 +757,17 @@ def import_fuel_entries(user_id, payload):
     created = 0
     errors = []
     try:
-        import boto3
-        from datetime import datetime, timezone
-        dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
         vehicles_by_name = {v["name"]: v["id"] for v in list_vehicles(user_id) if v.get("name")}
         for imp in imports:
-            vehicle_name = (imp.get("vehicleName") or "").strip()
-            entries = imp.get("entries") or []
-            if not vehicle_name:
-                errors.append("Missing vehicleName in import")
-                continue
-            if not isinstance(entries, list):
-                errors.append(f"Invalid entries for {vehicle_name}")
+            resolved = _resolve_import_vehicle(user_id, imp, vehicles_by_name, errors)
+            if not resolved:
                 continue
-            vehicle_id = vehicles_by_name.get(vehicle_name)
-            if not vehicle_id:
-                new_vehicle = create_vehicle(user_id, {"name": vehicle_name})
-                if new_vehicle:
-                    vehicle_id = new_vehicle["id"]
-                    vehicles_by_name[vehicle_name] = vehicle_id
-                else:
-                    errors.append(f"Failed to create vehicle {vehicle_name}")
-                    continue
-            for entry in entries:
-                if not isinstance(entry, dict):
+            vehicle_name, vehicle_id = resolved
+            for entry in imp.get("entries") or []:
+                data = _import_entry_data(entry, vehicle_name, errors)
+                if data is None:
                     continue
-                date_val = entry.get("date")
-                fuel_price = entry.get("fuelPrice")
-                fuel_litres = entry.get("fuelLitres")
-                odometer = entry.get("odometerKm")
-                if date_val is None and fuel_price is None and fuel_litres is None and odometer is None:
-                    continue
-                if isinstance(date_val, (int, float)) and date_val > 0:
-                    try:
-                        from datetime import datetime as dt, timedelta
-                        excel_epoch = dt(1899, 12, 30)
-                        date_val = (excel_epoch + timedelta(days=float(date_val))).strftime("%Y-%m-%d")
-                    except Exception:
-                        date_val = str(date_val)[:10]
-                elif date_val is not None:
-                    date_val = str(date_val)[:10]
-                try:
-                    fuel_price = float(fuel_price) if fuel_price is not None else 0
-                    fuel_litres = float(fuel_litres) if fuel_litres is not None else 0
-                    odometer = float(odometer) if odometer is not None else 0
-                except (TypeError, ValueError):
-                    errors.append(f"Invalid numbers in entry for {vehicle_name}: {entry}")
-                    continue
-                result = create_fuel_entry(user_id, vehicle_id, {
-                    "date": date_val or "",
-                    "fuelPrice": fuel_price,
-                    "fuelLitres": fuel_litres,
-                    "odometerKm": odometer,
-                })
-                if result:
+                if create_fuel_entry(user_id, vehicle_id, data):
                     created += 1
                 else:
                     errors.append(f"Failed to create entry for {vehicle_name}: {entry}")
@@ -773,6 +777,36 @@ def import_fuel_entries(user_id, payload):
     return {"created": created, "errors": errors}
 
 
+def build_fuel_import_items(user_id, imports):
+    """
+    Build full fuel-entry items (PK/SK included) for BatchWriteItem from an import list.
+    Same validation, date conversion and vehicle creation as import_fuel_entries. Returns (items, errors).
+    """
+    if not user_id:
+        return [], ["user_id missing"]
+    if not isinstance(imports, list):
+        return [], ["imports must be an array"]
+    now = isoNow()
+    items = []
+    errors = []
+    vehicles_by_name = {v["name"]: v["id"] for v in list_vehicles(user_id) if v.get("name")}
+    for imp in imports:
+        resolved = _resolve_import_vehicle(user_id, imp, vehicles_by_name, errors)
+        if not resolved:
+            continue
+        vehicle_name, vehicle_id = resolved
+        for entry in imp.get("entries") or []:
+            data = _import_entry_data(entry, vehicle_name, errors)
+            if data is None:
+                continue
+            items.append({
+                "PK": {"S": _pk(user_id)},
+                "SK": {"S": _fuel_sk(vehicle_id, str(uuid.uuid4()))},
+                **_build_fuel_item(data, now, now),
+            })
+    return items, errors
+
+
 def _valid_date_or_empty(date_value):
     s = str(date_value or "").strip()
     if not s:
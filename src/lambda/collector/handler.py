@@ -7,6 +7,8 @@ import time
 import boto3
 from collections import Counter
 
+from common.timestamps import isoNow
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -29,7 +31,7 @@ def handler(event, context):
         target_date_str = event["date"]
     else:
         # Default to yesterday for cron
-        yesterday = datetime.datetime.utcnow() - datetime.timedelta(days=1)
+        yesterday = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1)
         target_date_str = yesterday.strftime("%Y-%m-%d")
         
     date_obj = datetime.datetime.strptime(target_date_str, "%Y-%m-%d")
@@ -155,7 +157,7 @@ def handler(event, context):
                 'PK': f"STATS#DAILY#{target_date_str}",
                 'SK': "METADATA",
                 'stats': stats,
-                'updated_at': datetime.datetime.utcnow().isoformat()
+                'updated_at': isoNow()
             }
         )
     except Exception as e:
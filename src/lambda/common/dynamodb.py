@@ -0,0 +1,24 @@
+"""Shared botocore settings for the DynamoDB clients the API modules cache."""
+
+from botocore.config import Config
+
+# Keep-alive pooled connections so warm invocations reuse the TCP+TLS session (idle sockets
+# can die while the sandbox is frozen); short timeouts + adaptive retries fail fast instead
+# of eating the Lambda timeout. For the request/response hot path (handler, memes).
+DDB_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=1.0,
+    read_timeout=3.0,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
+
+# Finance and import paths (bpf, bpf_rules, investing) run long queries and bulk writes that
+# would rather ride out throttling than fail: same pooling, but botocore's default read timeout
+# and the legacy 5-attempt retry budget they had before the tuned config.
+DDB_BULK_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=1.0,
+    retries={"mode": "legacy", "max_attempts": 5},
+)
@@ -0,0 +1,8 @@
+"""Star-rating aggregate helpers shared by the site, media and highest-rated views."""
+
+
+def clampedAverage(totalSum, totalCount):
+    """Mean of a totalStarsSum/totalStarsCount pair clamped to 1-5, or None when unrated."""
+    if not isinstance(totalSum, (int, float)) or not isinstance(totalCount, (int, float)) or totalCount <= 0:
+        return None
+    return max(1.0, min(5.0, totalSum / totalCount))
@@ -1,8 +1,15 @@
 """CORS and JSON response helpers for API handlers."""
 
+import base64
 import decimal
+import gzip
 import json
 
+try:
+    import orjson
+except ImportError:  # only the main API Lambda ships the layer that carries orjson
+    orjson = None
+
 
 def _jsonDefault(o):
     # boto3 resource API returns DynamoDB numbers as Decimal
@@ -11,6 +18,30 @@ def _jsonDefault(o):
     raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
 
+def _stdlibDumps(body):
+    return json.dumps(body, default=_jsonDefault)
+
+
+def _stdlibDumpsBytes(body):
+    return _stdlibDumps(body).encode()
+
+
+def _orjsonDumpsBytes(body):
+    return orjson.dumps(body, default=_jsonDefault, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjsonDumps(body):
+    # orjson encodes straight to UTF-8 bytes; one decode yields the str API Gateway needs
+    return _orjsonDumpsBytes(body).decode()
+
+
+# Picked once at import so each response pays no backend check.
+# orjson's decode errors subclass json.JSONDecodeError, so callers catch either.
+jsonDumps = _orjsonDumps if orjson is not None else _stdlibDumps
+jsonDumpsBytes = _orjsonDumpsBytes if orjson is not None else _stdlibDumpsBytes
+jsonLoads = orjson.loads if orjson is not None else json.loads
+
+
 def jsonResponse(body, statusCode=200):
     """Return a response dict with JSON body and CORS headers for API Gateway."""
     return {
@@ -19,5 +50,33 @@ def jsonResponse(body, statusCode=200):
             "Content-Type": "application/json",
             "Access-Control-Allow-Origin": "*",
         },
-        "body": json.dumps(body, default=_jsonDefault) if not isinstance(body, str) else body,
+        "body": jsonDumps(body) if not isinstance(body, str) else body,
+    }
+
+
+# Below this a JSON body fits in a packet or two; compressing it costs more than it saves.
+GZIP_MIN_BYTES = 1024
+
+
+def gzipJsonResponse(body, event, statusCode=200):
+    """jsonResponse for large list payloads: serialize to UTF-8 bytes once and gzip them
+    (base64, as API Gateway requires) when the client accepts gzip and the body is over
+    GZIP_MIN_BYTES; otherwise decode the same bytes into a plain jsonResponse."""
+    payload = jsonDumpsBytes(body)
+    headers = event.get("headers") or {}
+    accept = headers.get("accept-encoding") or headers.get("Accept-Encoding") or ""
+    # Vary on every response, compressed or not, so a shared cache never hands one
+    # encoding to a client that negotiated the other
+    if "gzip" not in accept.lower() or len(payload) <= GZIP_MIN_BYTES:
+        response = jsonResponse(payload.decode(), statusCode)
+        response["headers"]["Vary"] = "Accept-Encoding"
+        return response
+    response = jsonResponse("", statusCode)
+    # Level 1 keeps most of the ratio on repetitive JSON at a fraction of the default's CPU
+    compressed = gzip.compress(payload, compresslevel=1)
+    return {
+        **response,
+        "headers": {**response["headers"], "Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        "body": base64.b64encode(compressed).decode(),
+        "isBase64Encoded": True,
     }
@@ -0,0 +1,10 @@
+"""UTC timestamp helpers for DynamoDB write paths."""
+
+import time
+
+
+def isoNow():
+    """UTC write timestamp, e.g. 2026-01-02T03:04:05.123456Z (sortable; same shape as isoformat()+"Z").
+    C-level gmtime/strftime, no datetime allocation."""
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int(t % 1 * 1_000_000):06d}Z"
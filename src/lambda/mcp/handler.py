@@ -16,12 +16,9 @@ import hmac
 import json
 import logging
 import os
-import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-from api import bpf, era_client  # noqa: E402
+from api import bpf, era_client
+from common.response import jsonDumps, jsonLoads
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -75,7 +72,7 @@ def _http(status, body=None):
     return {
         "statusCode": status,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(body) if body is not None else "",
+        "body": jsonDumps(body) if body is not None else "",
     }
 
 
@@ -124,7 +121,7 @@ def handler(event, context):
         return _http(401, {"error": "Unauthorized"})
 
     try:
-        req = json.loads(event.get("body") or "")
+        req = jsonLoads(event.get("body") or "")
     except (json.JSONDecodeError, TypeError):
         return _error(None, -32700, "Parse error", status=400)
     if not isinstance(req, dict):
@@ -158,6 +155,6 @@ def handler(event, context):
         if payload is None:
             return _error(req_id, -32602, f"Unknown tool: {name}")
         return _result(req_id, {
-            "content": [{"type": "text", "text": json.dumps(payload)}]
+            "content": [{"type": "text", "text": jsonDumps(payload)}]
         })
     return _error(req_id, -32601, f"Method not found: {method}")
@@ -24,25 +24,9 @@ way every other parameterised route in this codebase is.
 import json
 import logging
 import re
-import sys
 import uuid
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-try:
-    from common.response import jsonResponse
-except ImportError:
-    # Fallback if import fails (mirrors api/handler.py and tools/handler.py)
-    def jsonResponse(body, statusCode=200):
-        return {
-            "statusCode": statusCode,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-            },
-            "body": json.dumps(body) if not isinstance(body, str) else body,
-        }
+
+from common.response import jsonResponse
 
 from social import handler as directHandler
 from social import media, secrets, storage
@@ -0,0 +1,35 @@
+"""Shared pytest fixtures for the Lambda tests."""
+import sys
+
+import pytest
+
+# Modules that cache boto3 clients at module scope, and the globals holding them.
+# Tests patch boto3.client per test, so a client cached by one test must not
+# leak into the next.
+CACHED_CLIENTS = {
+    "api.handler": ("_dynamodb", "_s3Client", "_cognitoClient"),
+    "api.investing": ("_dynamodb",),
+    "api.memes": ("_dynamodb", "_s3Client"),
+    "api.generate_description": ("_bedrock",),
+}
+
+# Per-container TTL caches (dicts) that must start empty in each test.
+CACHED_DICTS = {
+    "api.handler": ("_categoryNameCache", "_presignedUrlCache", "_groupsParseCache"),
+    "api.financial": ("_cache",),
+}
+
+
+@pytest.fixture(autouse=True)
+def _resetCachedClients():
+    for module_name, attrs in CACHED_CLIENTS.items():
+        module = sys.modules.get(module_name)
+        if module is not None:
+            for attr in attrs:
+                setattr(module, attr, None)
+    for module_name, attrs in CACHED_DICTS.items():
+        module = sys.modules.get(module_name)
+        if module is not None:
+            for attr in attrs:
+                getattr(module, attr).clear()
+    yield
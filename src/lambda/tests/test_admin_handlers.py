@@ -357,7 +357,7 @@ def test_deleteAdminUser_superadmin_deletes_user(mock_boto_client):
     }
     mock_dynamo = MagicMock()
     mock_dynamo.query.return_value = {"Items": []}
-    mock_boto_client.side_effect = lambda svc: mock_cognito if svc == "cognito-idp" else mock_dynamo
+    mock_boto_client.side_effect = lambda svc, **kw: mock_cognito if svc == "cognito-idp" else mock_dynamo
     event = _admin_event("/admin/users/test@example.com", method="DELETE")
     event["rawPath"] = "/admin/users/test@example.com"
     event["pathParameters"] = {"username": "test@example.com"}
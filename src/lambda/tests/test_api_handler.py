@@ -52,6 +52,32 @@ def test_health_returns_ok(healthEvent):
     assert "true" in result["body"]
 
 
+def test_logLevel_falls_back_to_info_for_unknown_names():
+    import logging
+    from api.handler import _logLevel
+    assert _logLevel("debug") == logging.DEBUG
+    assert _logLevel(" WARNING ") == logging.WARNING
+    assert _logLevel("VERBOSE") == _logLevel("") == _logLevel(None) == logging.INFO
+
+
+def test_handler_unknown_route_returns_404(healthEvent):
+    from api.handler import handler
+    healthEvent["rawPath"] = healthEvent["requestContext"]["http"]["path"] = "/nope"
+    result = handler(healthEvent, None)
+    assert result["statusCode"] == 404
+    assert json.loads(result["body"]) == {"error": "Not Found", "path": "/nope", "method": "GET"}
+
+
+def test_handler_options_preflight_short_circuits(healthEvent):
+    from api import handler as h
+    healthEvent["requestContext"]["http"]["method"] = "OPTIONS"
+    with patch.object(h, "getUserInfo") as get_user:
+        result = h.handler(healthEvent, None)
+    assert result["statusCode"] == 200
+    assert result["headers"]["Access-Control-Allow-Origin"] == "*"
+    assert not get_user.called
+
+
 def test_sites_returns_json(sitesEvent):
     os.environ["TABLE_NAME"] = "fus-main"
     try:
@@ -123,6 +149,175 @@ def test_listCategories_public_returns_categories(mock_boto_client):
     assert result["statusCode"] == 200
     body = json.loads(result["body"])
     assert "categories" in body
+    assert mock_dynamo.query.call_args.kwargs["ProjectionExpression"] == "PK, #name, description"
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_listSites_decodes_items_and_sorts_by_rating(mock_boto_client, sitesEvent):
+    """GET /sites decodes DynamoDB items, computes averageRating and sorts best-first."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.get_paginator.return_value.paginate.return_value = [{"Items": [
+        {
+            "PK": {"S": "SITE#a"}, "SK": {"S": "METADATA"}, "url": {"S": "https://a.example"},
+            "title": {"S": "Alpha"}, "tags": {"L": [{"S": "news"}]}, "categoryIds": {"L": []},
+            "totalStarsSum": {"N": "6"}, "totalStarsCount": {"N": "2"},
+        },
+        {
+            "PK": {"S": "SITE#b"}, "SK": {"S": "METADATA"}, "url": {"S": "https://b.example"},
+            "title": {"S": "Beta"}, "descriptionAiGenerated": {"BOOL": True},
+            "totalStarsSum": {"N": "9"}, "totalStarsCount": {"N": "2"},
+        },
+    ]}]
+    mock_boto_client.return_value = mock_dynamo
+
+    result = handler(sitesEvent, None)
+    assert result["statusCode"] == 200
+    sites = json.loads(result["body"])["sites"]
+    assert [s["PK"] for s in sites] == ["SITE#b", "SITE#a"]
+    assert sites[0]["averageRating"] == 4.5
+    assert sites[0]["descriptionAiGenerated"] is True
+    assert sites[1]["tags"] == ["news"]
+    assert sites[1]["totalStarsCount"] == 2
+    assert sites[1]["categories"] == []
+    kwargs = mock_dynamo.get_paginator.return_value.paginate.call_args.kwargs
+    projected = {a.strip() for a in kwargs["ProjectionExpression"].split(",")}
+    assert "scrapedContent" not in projected and "tags" not in projected
+    assert {"PK", "logoKey", "totalStarsSum", "totalStarsCount"} <= projected
+    assert kwargs["PaginationConfig"] == {"MaxItems": 100, "PageSize": 100}
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_listSites_filters_before_resolving_categories(mock_boto_client, sitesEvent):
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.get_paginator.return_value.paginate.return_value = [{"Items": [
+        {"PK": {"S": "SITE#a"}, "title": {"S": "Python Weekly"}, "categoryIds": {"L": [{"S": "CATEGORY#1"}]}},
+        {"PK": {"S": "SITE#b"}, "title": {"S": "Rust"}, "categoryIds": {"L": [{"S": "CATEGORY#1"}, {"S": "CATEGORY#2"}]}},
+        {"PK": {"S": "SITE#c"}, "title": {"S": "Python"}, "url": {"S": "https://c.example"}, "categoryIds": {"L": []}},
+    ]}]
+    mock_dynamo.batch_get_item.return_value = {"Responses": {"fus-main": [
+        {"PK": {"S": "CATEGORY#1"}, "name": {"S": "News"}},
+    ]}}
+    mock_boto_client.return_value = mock_dynamo
+    sitesEvent["queryStringParameters"] = {"q": "PYTHON", "categoryIds": "CATEGORY#1"}
+
+    sites = json.loads(handler(sitesEvent, None)["body"])["sites"]
+    assert [s["PK"] for s in sites] == ["SITE#a"]
+    assert sites[0]["categories"] == [{"id": "CATEGORY#1", "name": "News"}]
+    keys = mock_dynamo.batch_get_item.call_args.kwargs["RequestItems"]["fus-main"]["Keys"]
+    assert [k["PK"]["S"] for k in keys] == ["CATEGORY#1"]
+    # A match must not span title and url ("Python" + "https://...")
+    sitesEvent["queryStringParameters"] = {"q": "pythonhttps"}
+    assert json.loads(handler(sitesEvent, None)["body"])["sites"] == []
+
+
+def test_prefetchPages_requests_next_page_while_current_is_consumed():
+    import threading
+    from api.handler import _prefetchPages
+    from botocore.exceptions import ClientError
+    second_requested = threading.Event()
+
+    def pages():
+        for n in (1, 2):
+            if n == 2:
+                second_requested.set()
+            yield {"Items": [n]}
+        raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "Query")
+
+    gen = _prefetchPages(pages())
+    assert next(gen) == {"Items": [1]}
+    assert second_requested.wait(2)
+    assert next(gen) == {"Items": [2]}
+    with pytest.raises(ClientError):
+        next(gen)
+    assert list(_prefetchPages([])) == []
+
+
+def test_matchRoute_prefers_static_segments_and_backtracks_to_params():
+    from api.handler import _buildRouteTrie, _matchRoute
+    trie = _buildRouteTrie({
+        ("GET", "/v/{id}"): "get",
+        ("GET", "/v/{vehicleId}/fuel/export"): "export",
+        ("DELETE", "/v/{vehicleId}/fuel/{fillupId}"): "delete",
+    })
+    assert _matchRoute(trie, "GET", ["v", "a1"]) == ("get", ("id",), ("a1",))
+    assert _matchRoute(trie, "GET", ["v", "a1", "fuel", "export"]) == ("export", ("vehicleId",), ("a1",))
+    # "export" is static only for GET, so DELETE falls back to the {fillupId} branch
+    assert _matchRoute(trie, "DELETE", ["v", "a1", "fuel", "export"]) == ("delete", ("vehicleId", "fillupId"), ("a1", "export"))
+    assert _matchRoute(trie, "PUT", ["v", "a1"]) is None
+    assert _matchRoute(trie, "GET", ["v", "a1", "fuel"]) is None
+
+
+def _paramRouteFor(h, method, parts):
+    match = h._matchRoute(h._PARAM_ROUTE_TRIE, method, parts)
+    return match[0] if match else None
+
+
+def test_vehicles_expenses_import_segment_is_never_a_vehicle_id():
+    """Only POST /vehicles-expenses/import exists; other methods 404 instead of binding {id}="import"."""
+    from api import handler as h
+    for method in ("GET", "PUT", "DELETE"):
+        assert _paramRouteFor(h, method, ["vehicles-expenses", "import"]) is None
+        assert _paramRouteFor(h, method, ["vehicles-expenses", "import", "fuel"]) is None
+    assert _paramRouteFor(h, "GET", ["vehicles-expenses", "v1"]) is h.getVehicleExpense
+    result = h.handler(_admin_event("/vehicles-expenses/import", method="GET"), None)
+    assert result["statusCode"] == 404
+    assert json.loads(result["body"])["error"] == "Not Found"
+
+
+def test_handler_param_route_prefers_pathParameters_then_decoded_segment():
+    from api import handler as h
+    event = _admin_event("/admin/users/bob%40example.com/groups/editors", method="DELETE")
+    remove = MagicMock(return_value={"statusCode": 204})
+    trie = h._buildRouteTrie({("DELETE", "/admin/users/{username}/groups/{groupName}"): remove})
+    with patch.object(h, "_PARAM_ROUTE_TRIE", trie):
+        assert h.handler(event, None) == {"statusCode": 204}
+        remove.assert_called_once_with(event, "bob@example.com", "editors")
+        event["pathParameters"] = {"username": "alice", "groupName": "admins"}
+        h.handler(event, None)
+        remove.assert_called_with(event, "alice", "admins")
+
+
+def test_decodeSite_skips_averageRating_without_ratings():
+    from api.handler import _decodeSite
+    base = {"PK": {"S": "SITE#a"}, "SK": {"S": "METADATA"}}
+    assert "averageRating" not in _decodeSite(base)
+    assert "averageRating" not in _decodeSite({**base, "totalStarsSum": {"N": "0"}, "totalStarsCount": {"N": "0"}})
+    assert "averageRating" not in _decodeSite({**base, "totalStarsCount": {"N": "2"}})
+    assert _decodeSite({**base, "totalStarsSum": {"N": "7"}, "totalStarsCount": {"N": "2"}})["averageRating"] == 3.5
+
+
+@patch("api.handler.MEDIA_BUCKET", "media-bucket")
+@patch("boto3.client")
+def test_addLogoUrls_reuses_presigned_url_per_logoKey(mock_boto_client):
+    from api.handler import _addLogoUrls
+    mock_s3 = MagicMock()
+    mock_s3.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://signed/{Params['Key']}"
+    mock_boto_client.return_value = mock_s3
+    sites = [{"logoKey": "logos/a/1.png"}, {"logoKey": "logos/a/1.png"}, {"logoUrl": "https://cdn/x.png"}]
+    _addLogoUrls(sites)
+    again = [{"logoKey": "logos/a/1.png"}]
+    _addLogoUrls(again)
+    assert [s["logoUrl"] for s in sites + again] == ["https://signed/logos/a/1.png"] * 2 + ["https://cdn/x.png", "https://signed/logos/a/1.png"]
+    assert mock_s3.generate_presigned_url.call_count == 1
+
+
+def test_presignedGetUrl_cache_is_bounded_and_drops_stale_urls_first():
+    from api import handler as h
+    mock_s3 = MagicMock()
+    mock_s3.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://signed/{Params['Key']}"
+    with patch.object(h, "PRESIGNED_URL_CACHE_MAX", 2):
+        h._presignedGetUrl(mock_s3, "old", 0)
+        h._presignedGetUrl(mock_s3, "fresh", 3000)
+        # At t=3400 "old" has under PRESIGNED_GET_MIN_REMAINING_SEC left, so it is evicted, "fresh" kept
+        h._presignedGetUrl(mock_s3, "new", 3400)
+        assert list(h._presignedUrlCache) == ["fresh", "new"]
+        # Nothing stale at the cap: the cache is cleared rather than grown
+        h._presignedGetUrl(mock_s3, "newer", 3400)
+        assert list(h._presignedUrlCache) == ["newer"]
 
 
 # ------------------------------------------------------------------------------
@@ -208,10 +403,9 @@ def test_updateSite_deleteLogo_removes_logo(mock_boto_client):
     """PUT /sites with deleteLogo: true triggers S3 delete and DynamoDB REMOVE logoKey."""
     from api.handler import handler
     mock_dynamo = MagicMock()
-    mock_dynamo.get_item.return_value = {
-        "Item": {"logoKey": {"S": "logos/SITE#abc/old-uuid.png"}},
+    mock_dynamo.update_item.return_value = {
+        "Attributes": {"logoKey": {"S": "logos/SITE#abc/old-uuid.png"}},
     }
-    mock_dynamo.update_item.return_value = {}
     mock_s3 = MagicMock()
     mock_boto_client.side_effect = lambda service, **kw: mock_dynamo if service == "dynamodb" else mock_s3
 
@@ -227,6 +421,27 @@ def test_updateSite_deleteLogo_removes_logo(mock_boto_client):
     update_call = mock_dynamo.update_item.call_args
     assert "REMOVE" in update_call.kwargs["UpdateExpression"]
     assert "logoKey" in update_call.kwargs["UpdateExpression"]
+    assert update_call.kwargs["ReturnValues"] == "UPDATED_OLD"
+    mock_dynamo.get_item.assert_not_called()
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("api.handler.MEDIA_BUCKET", "test-media-bucket")
+@patch("boto3.client")
+def test_updateSite_same_logoKey_keeps_object(mock_boto_client):
+    """Re-saving the current logoKey must not delete the object it points to."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.update_item.return_value = {"Attributes": {"logoKey": {"S": "logos/SITE#abc/cur.png"}}}
+    mock_s3 = MagicMock()
+    mock_boto_client.side_effect = lambda service, **kw: mock_dynamo if service == "dynamodb" else mock_s3
+
+    event = _admin_event("/sites", method="PUT", body={
+        "id": "SITE#abc", "categoryIds": [], "logoKey": "logos/SITE#abc/cur.png",
+    })
+    assert handler(event, None)["statusCode"] == 200
+    mock_s3.delete_object.assert_not_called()
+    assert "ExpressionAttributeNames" not in mock_dynamo.update_item.call_args.kwargs
 
 
 # Logo-from-URL tests
@@ -641,3 +856,279 @@ def test_getStar_returns_rating_when_present(mock_boto_client):
     body = json.loads(result["body"])
     assert body["siteId"] == "SITE#xyz"
     assert body["rating"] == 4
+
+
+def _star_cancelled(star_item=None, meta_item=None, star_failed=False, meta_failed=False):
+    """TransactionCanceledException as botocore raises it, with ALL_OLD items on failed conditions."""
+    from botocore.exceptions import ClientError
+
+    def reason(failed, item):
+        if not failed:
+            return {"Code": "None"}
+        return {"Code": "ConditionalCheckFailed", **({"Item": item} if item else {})}
+
+    return ClientError({
+        "Error": {"Code": "TransactionCanceledException"},
+        "CancellationReasons": [reason(star_failed, star_item), reason(meta_failed, meta_item)],
+    }, "TransactWriteItems")
+
+
+def _star_writes(mock_dynamo):
+    return [[next(iter(t.values())) for t in c.kwargs["TransactItems"]]
+            for c in mock_dynamo.transact_write_items.call_args_list]
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_setStar_first_rating_is_a_single_write(mock_boto_client):
+    """POST /stars for a new rating writes star + aggregates in one transaction with no read."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_boto_client.return_value = mock_dynamo
+
+    event = _user_event("/stars", method="POST")
+    event["body"] = json.dumps({"siteId": "SITE#xyz", "rating": 4})
+    result = handler(event, None)
+
+    assert result["statusCode"] == 200
+    assert not mock_dynamo.get_item.called and not mock_dynamo.transact_get_items.called
+    [(put, update)] = _star_writes(mock_dynamo)
+    assert put["ConditionExpression"] == "attribute_not_exists(rating)"
+    assert update["ExpressionAttributeValues"][":sumDelta"] == {"N": "4"}
+    assert update["ExpressionAttributeValues"][":countDelta"] == {"N": "1"}
+    assert update["ConditionExpression"] == "attribute_exists(PK)"
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_setStar_updates_aggregates_with_rating_delta(mock_boto_client):
+    """Re-rating retries with the old rating returned by the failed condition and writes only the delta."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.transact_write_items.side_effect = [
+        _star_cancelled(star_item={"rating": {"N": "2"}}, star_failed=True),
+        {},
+    ]
+    mock_boto_client.return_value = mock_dynamo
+
+    event = _user_event("/stars", method="POST")
+    event["body"] = json.dumps({"siteId": "SITE#xyz", "rating": 5})
+    result = handler(event, None)
+
+    assert result["statusCode"] == 200
+    put, update = _star_writes(mock_dynamo)[1]
+    assert put["Item"]["rating"] == {"N": "5"}
+    assert put["ExpressionAttributeValues"] == {":old": {"N": "2"}}
+    assert update["ExpressionAttributeValues"][":sumDelta"] == {"N": "3"}
+    assert update["ExpressionAttributeValues"][":countDelta"] == {"N": "0"}
+    assert update["ConditionExpression"] == "attribute_exists(PK) AND totalStarsCount > :zero"
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_setStar_rerate_on_legacy_site_without_count_bumps_count(mock_boto_client):
+    """A re-rate on a site whose count is missing writes countDelta 1, as before."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.transact_write_items.side_effect = [
+        _star_cancelled(star_item={"rating": {"N": "3"}}, star_failed=True),
+        _star_cancelled(meta_item={"PK": {"S": "SITE#xyz"}}, meta_failed=True),
+        {},
+    ]
+    mock_boto_client.return_value = mock_dynamo
+
+    event = _user_event("/stars", method="POST")
+    event["body"] = json.dumps({"siteId": "SITE#xyz", "rating": 4})
+    result = handler(event, None)
+
+    assert result["statusCode"] == 200
+    _, update = _star_writes(mock_dynamo)[2]
+    assert update["ExpressionAttributeValues"][":sumDelta"] == {"N": "1"}
+    assert update["ExpressionAttributeValues"][":countDelta"] == {"N": "1"}
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_setStar_404s_deleted_site_and_409s_after_repeated_conflicts(mock_boto_client):
+    """A failed METADATA condition with no item is a missing site; endless conflicts give up with 409."""
+    from api.handler import handler, SET_STAR_MAX_ATTEMPTS
+    mock_dynamo = MagicMock()
+    mock_dynamo.transact_write_items.side_effect = _star_cancelled(meta_failed=True)
+    mock_boto_client.return_value = mock_dynamo
+
+    event = _user_event("/stars", method="POST")
+    event["body"] = json.dumps({"siteId": "SITE#xyz", "rating": 4})
+    assert handler(event, None)["statusCode"] == 404
+    assert mock_dynamo.transact_write_items.call_count == 1
+
+    mock_dynamo.transact_write_items.reset_mock()
+    mock_dynamo.transact_write_items.side_effect = _star_cancelled()
+    assert handler(event, None)["statusCode"] == 409
+    assert mock_dynamo.transact_write_items.call_count == SET_STAR_MAX_ATTEMPTS
+
+
+def test_resolveCategoriesForSites_caches_names_between_calls():
+    """Category names are batch-fetched once, then served from the warm-container cache."""
+    from api import handler as h
+    mock_dynamo = MagicMock()
+    mock_dynamo.batch_get_item.return_value = {"Responses": {"fus-main": [
+        {"PK": {"S": "CATEGORY#1"}, "name": {"S": "News"}},
+    ]}}
+    with patch.object(h, "TABLE_NAME", "fus-main"):
+        for _ in range(2):
+            sites = [{"categoryIds": ["CATEGORY#1"]}]
+            h._resolveCategoriesForSites(mock_dynamo, sites)
+            assert sites[0]["categories"] == [{"id": "CATEGORY#1", "name": "News"}]
+    assert mock_dynamo.batch_get_item.call_count == 1
+
+
+def test_resolveCategoriesForSites_retries_unprocessed_keys():
+    """UnprocessedKeys from a throttled BatchGetItem are re-requested, not dropped."""
+    from api import handler as h
+    mock_dynamo = MagicMock()
+    key2 = {"PK": {"S": "CATEGORY#2"}, "SK": {"S": "METADATA"}}
+    mock_dynamo.batch_get_item.side_effect = [
+        {"Responses": {"fus-main": [{"PK": {"S": "CATEGORY#1"}, "name": {"S": "News"}}]},
+         "UnprocessedKeys": {"fus-main": {"Keys": [key2], "ProjectionExpression": "PK, #name",
+                                          "ExpressionAttributeNames": {"#name": "name"}}}},
+        {"Responses": {"fus-main": [{"PK": {"S": "CATEGORY#2"}, "name": {"S": "Tools"}}]}},
+    ]
+    sites = [{"categoryIds": ["CATEGORY#1", "CATEGORY#2"]}]
+    with patch.object(h, "TABLE_NAME", "fus-main"), patch.object(h.time, "sleep"):
+        h._resolveCategoriesForSites(mock_dynamo, sites)
+    assert sites[0]["categories"] == [{"id": "CATEGORY#1", "name": "News"}, {"id": "CATEGORY#2", "name": "Tools"}]
+    assert mock_dynamo.batch_get_item.call_args_list[1].kwargs["RequestItems"]["fus-main"]["Keys"] == [key2]
+
+
+def test_batchGet_fetches_every_chunk_when_over_100_keys():
+    """More than 100 keys are split into BatchGetItem chunks fetched concurrently; none are lost."""
+    from api import handler as h
+    mock_dynamo = MagicMock()
+    mock_dynamo.batch_get_item.side_effect = lambda RequestItems: {"Responses": {"fus-main": [
+        {"PK": k["PK"]} for k in RequestItems["fus-main"]["Keys"]
+    ]}}
+    keys = [{"PK": {"S": f"CATEGORY#{i}"}, "SK": {"S": "METADATA"}} for i in range(250)]
+    with patch.object(h, "TABLE_NAME", "fus-main"):
+        items, unprocessed = h._batchGet(mock_dynamo, keys)
+    assert mock_dynamo.batch_get_item.call_count == 3 and unprocessed == []
+    assert sorted(i["PK"]["S"] for i in items) == sorted(k["PK"]["S"] for k in keys)
+
+
+def test_ddb_client_parses_attribute_values_like_stock_botocore():
+    """The raw AttributeValue parser installed on _ddb() matches botocore's output, blobs included."""
+    import json
+    from botocore.parsers import JSONParser
+    from api import handler as h
+    client = h._ddb()
+    op = client.meta.service_model.operation_model("Query")
+    parser = client._endpoint._response_parser_factory.create_parser("json")
+    assert isinstance(parser, h._RawAttributeValueParser)
+    items = [
+        {"PK": {"S": "SITE#1"}, "n": {"N": "4"}, "l": {"L": [{"S": "a"}, {"M": {"k": {"BOOL": True}}}]}},
+        {"PK": {"S": "SITE#2"}, "blob": {"B": "aGk="}, "m": {"M": {"bs": {"BS": ["aGk="]}}}},
+    ]
+    resp = {"status_code": 200, "headers": {}, "body": json.dumps({"Items": items, "Count": 2}).encode()}
+    assert parser.parse(resp, op.output_shape) == JSONParser().parse(resp, op.output_shape)
+
+
+def test_getUserInfo_parses_claims_once_per_event():
+    """Repeat calls reuse the parsed claims but hand out independent dicts."""
+    from api import handler as h
+    event = _user_event("/me")
+    event["requestContext"]["authorizer"]["jwt"]["claims"]["cognito:groups"] = '["admin", "user"]'
+    with patch.object(h.json, "loads", wraps=h.json.loads) as loads:
+        first = h.getUserInfo(event)
+        first["customGroups"] = ["Squash"]
+        second = h.getUserInfo(event)
+    assert loads.call_count == 1
+    assert second["groups"] == ["admin", "user"]
+    assert "customGroups" not in second
+
+
+def test_getUserInfo_reuses_group_parse_across_events():
+    from api import handler as h
+    events = [_user_event("/me"), _user_event("/me")]
+    for event in events:
+        event["requestContext"]["authorizer"]["jwt"]["claims"]["cognito:groups"] = '["admin", "user"]'
+    with patch.object(h.json, "loads", wraps=h.json.loads) as loads:
+        first, second = (h.getUserInfo(e) for e in events)
+    first["groups"].append("mutated")
+    assert loads.call_count == 1
+    assert second["groups"] == ["admin", "user"]
+    assert h.getUserInfo(_user_event("/me"))["groups"] == ["user"]
+    assert h._parseGroupsString("[admin manager]") == ["admin", "manager"]
+
+
+def test_getEffectiveUserInfo_queries_custom_groups_once_per_event():
+    """_requireAdmin and the route body share one effective-user resolution per event."""
+    from api import handler as h
+    event = _user_event("/admin/users")
+    event["requestContext"]["authorizer"]["jwt"]["claims"]["cognito:groups"] = "admin"
+    with patch.object(h, "_getUserCustomGroups", return_value=["Squash"]) as custom:
+        user, err = h._requireAdmin(event)
+        user["groups"] = []
+        again = h.getEffectiveUserInfo(event)
+    assert err is None
+    assert custom.call_count == 1
+    assert again["groups"] == ["admin"] and again["customGroups"] == ["Squash"]
+
+
+def test_deserializeSiteItem_matches_generic_decoder():
+    """The site-specialized decoder agrees with _deserializeItem, including off-schema types."""
+    from api.handler import _deserializeItem, _deserializeSiteItem
+    item = {
+        "PK": {"S": "SITE#1"}, "url": {"S": "https://x.com"}, "title": {"NULL": True},
+        "categoryIds": {"L": [{"S": "CATEGORY#1"}]}, "totalStarsSum": {"N": "7"}, "extra": {"BOOL": False},
+    }
+    assert _deserializeSiteItem(item) == _deserializeItem(item)
+
+
+def test_deserializeItem_matches_TypeDeserializer_with_plain_numbers():
+    """The direct decoder agrees with boto3's TypeDeserializer (Decimals as int/float, sets as lists)."""
+    import decimal
+    from boto3.dynamodb.types import TypeDeserializer
+    from api.handler import _deserializeItem
+
+    def plain(v):
+        if isinstance(v, decimal.Decimal):
+            return int(v) if v == v.to_integral_value() else float(v)
+        if isinstance(v, (list, set)):
+            return sorted(plain(x) for x in v) if isinstance(v, set) else [plain(x) for x in v]
+        if isinstance(v, dict):
+            return {k: plain(x) for k, x in v.items()}
+        return v
+
+    item = {
+        "s": {"S": "x"}, "i": {"N": "42"}, "f": {"N": "4.5"}, "whole": {"N": "3.0"}, "exp": {"N": "1E+2"},
+        "b": {"BOOL": True}, "nul": {"NULL": True},
+        "l": {"L": [{"S": "a"}, {"N": "1"}, {"M": {"k": {"N": "-0.25"}}}]},
+        "ss": {"SS": ["a", "b"]}, "ns": {"NS": ["1", "2.5"]},
+    }
+    decoded = _deserializeItem(item)
+    expected = {k: plain(TypeDeserializer().deserialize(v)) for k, v in item.items()}
+    decoded["ss"], decoded["ns"] = sorted(decoded["ss"]), sorted(decoded["ns"])
+    assert decoded == expected
+    assert type(decoded["i"]) is int and type(decoded["whole"]) is int and type(decoded["f"]) is float
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("api.handler.time.sleep")
+@patch("boto3.client")
+def test_deleteCategory_bulk_ids_batches_and_retries_unprocessed(mock_boto_client, _mock_sleep):
+    """DELETE /categories {ids} sends 25-key BatchWriteItem chunks and retries UnprocessedItems."""
+    from api.handler import handler
+    ids = [f"CATEGORY#{i}" for i in range(30)]
+    mock_dynamo = MagicMock()
+    first_chunk_leftover = {"fus-main": [{"DeleteRequest": {"Key": {"PK": {"S": ids[0]}, "SK": {"S": "METADATA"}}}}]}
+    mock_dynamo.batch_write_item.side_effect = [
+        {"UnprocessedItems": first_chunk_leftover}, {"UnprocessedItems": {}}, {},
+    ]
+    mock_boto_client.return_value = mock_dynamo
+
+    result = handler(_admin_event("/categories", method="DELETE", body={"ids": ids + [ids[0]]}), None)
+
+    assert result["statusCode"] == 200
+    assert json.loads(result["body"]) == {"ids": ids, "deleted": True}
+    sizes = [len(c.kwargs["RequestItems"]["fus-main"]) for c in mock_dynamo.batch_write_item.call_args_list]
+    assert sizes == [25, 1, 5]
+    mock_dynamo.delete_item.assert_not_called()
@@ -371,3 +371,12 @@ def test_summary_prompt_is_capped_and_single_call(monkeypatch):
     assert kwargs["modelId"] == bpf.BEDROCK_MODEL_ID
     prompt = kwargs["messages"][0]["content"][0]["text"]
     assert len(prompt) < bpf.MAX_PROMPT_CHARS + 400
+
+
+def test_bpf_modules_use_bulk_dynamodb_config():
+    from api import bpf, bpf_rules, investing
+    from common.dynamodb import DDB_BULK_CLIENT_CONFIG
+    assert DDB_BULK_CLIENT_CONFIG.retries == {"mode": "legacy", "max_attempts": 5}
+    assert DDB_BULK_CLIENT_CONFIG.read_timeout == 60
+    for module in (bpf, bpf_rules, investing):
+        assert module.DDB_BULK_CLIENT_CONFIG is DDB_BULK_CLIENT_CONFIG
@@ -158,3 +158,20 @@ def test_summarize_with_bedrock_converse_response():
     assert err is None
     assert summary == "A great website for developers and builders."
     mock_client.converse.assert_called_once()
+
+
+def test_try_about_pages_picks_longest_text_across_candidates():
+    """try_about_pages fetches candidates concurrently and keeps the longest extract."""
+    from api.generate_description import try_about_pages
+
+    pages = {
+        "https://example.com/about": ("<p>" + "a" * 60 + "</p>", None),
+        "https://example.com/about-us": (None, "HTTP 404: Not Found"),
+        "https://example.com/about.html": ("<p>" + "b" * 120 + "</p>", None),
+        "https://example.com/about-us.html": ("<p>short</p>", None),
+        "https://example.com": ("<p>" + "c" * 80 + "</p>", None),
+    }
+    with patch("api.generate_description.fetch_html", side_effect=lambda u: pages[u]):
+        text, used_url = try_about_pages("example.com")
+    assert used_url == "https://example.com/about.html"
+    assert text == "b" * 120
@@ -2,7 +2,7 @@
 import json
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
@@ -182,3 +182,12 @@ def test_suggest_tickers_drops_hallucinations():
          )):
         results = investing.suggest_tickers("big tech")
     assert [r["symbol"] for r in results] == ["AAPL"]
+
+
+def test_fetch_json_caches_successful_responses():
+    from api import financial
+    resp = MagicMock(status=200, data=b'{"ok": true}')
+    with patch.object(financial._http, "request", return_value=resp) as mock_request:
+        assert financial._fetch_json("https://query1.finance.yahoo.com/x") == {"ok": True}
+        assert financial._fetch_json("https://query1.finance.yahoo.com/x") == {"ok": True}
+    assert mock_request.call_count == 1
@@ -85,6 +85,79 @@ def test_listMedia_with_id_returns_404_when_not_found(mock_boto_client):
     assert result["statusCode"] == 404
 
 
+@pytest.mark.parametrize("mode,joiner", [("", " AND "), ("or", " OR ")])
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_listMedia_pushes_category_filter_into_query(mock_boto_client, mode, joiner):
+    """?categoryIds= becomes a DynamoDB FilterExpression instead of a Python post-filter."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.query.return_value = {"Items": [
+        {"PK": {"S": "MEDIA#1"}, "title": {"S": "One"}, "categoryIds": {"L": [{"S": "CAT#a"}]}},
+    ]}
+    mock_dynamo.batch_get_item.return_value = {"Responses": {"fus-main": []}}
+    mock_boto_client.return_value = mock_dynamo
+
+    event = {
+        "rawPath": "/media",
+        "requestContext": {"http": {"method": "GET", "path": "/media"}},
+        "queryStringParameters": {"categoryIds": "CAT#a,CAT#b", "categoryMode": mode},
+    }
+    result = handler(event, None)
+
+    assert result["statusCode"] == 200
+    kw = mock_dynamo.query.call_args.kwargs
+    assert kw["FilterExpression"] == joiner.join(["contains(categoryIds, :c0)", "contains(categoryIds, :c1)"])
+    assert kw["ExpressionAttributeValues"][":c0"] == {"S": "CAT#a"}
+    assert kw["ExpressionAttributeValues"][":c1"] == {"S": "CAT#b"}
+    assert "mediaKey" in kw["ProjectionExpression"] and "createdAt" not in kw["ProjectionExpression"]
+    assert [m["PK"] for m in json.loads(result["body"])["media"]] == ["MEDIA#1"]
+
+
+def test_dynamoItemToMedia_decodes_every_attribute_type():
+    from api.handler import _dynamoItemToMedia
+    m = _dynamoItemToMedia({
+        "PK": {"S": "MEDIA#1"},
+        "width": {"N": "1e3"},
+        "totalStarsSum": {"N": "9"},
+        "totalStarsCount": {"N": "2"},
+        "categoryIds": {"L": [{"S": "MEDIA_CATEGORY#1"}]},
+        "featured": {"BOOL": True},
+        "meta": {"M": {"fps": {"N": "29.97"}}},
+    })
+    assert m["width"] == 1000 and isinstance(m["width"], int)
+    assert m["categoryIds"] == ["MEDIA_CATEGORY#1"]
+    assert m["featured"] is True and m["meta"] == {"fps": 29.97}
+    assert m["averageRating"] == 4.5
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_listMedia_search_runs_before_category_resolution(mock_boto_client):
+    """?q= drops non-matching media before their categories are batch-fetched."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.query.return_value = {"Items": [
+        {"PK": {"S": "MEDIA#1"}, "title": {"S": "Sunset"}, "categoryIds": {"L": [{"S": "MEDIA_CATEGORY#a"}]}},
+        {"PK": {"S": "MEDIA#2"}, "title": {"S": "Cat"}, "description": {"S": "a SUNSET cat"},
+         "categoryIds": {"L": [{"S": "MEDIA_CATEGORY#b"}]}},
+        {"PK": {"S": "MEDIA#3"}, "title": {"S": "Dawn"}, "categoryIds": {"L": [{"S": "MEDIA_CATEGORY#c"}]}},
+    ]}
+    mock_dynamo.batch_get_item.return_value = {"Responses": {"fus-main": []}}
+    mock_boto_client.return_value = mock_dynamo
+
+    event = {
+        "rawPath": "/media",
+        "requestContext": {"http": {"method": "GET", "path": "/media"}},
+        "queryStringParameters": {"q": "sunset"},
+    }
+    result = handler(event, None)
+
+    assert [m["PK"] for m in json.loads(result["body"])["media"]] == ["MEDIA#2", "MEDIA#1"]
+    keys = mock_dynamo.batch_get_item.call_args.kwargs["RequestItems"]["fus-main"]["Keys"]
+    assert sorted(k["PK"]["S"] for k in keys) == ["MEDIA_CATEGORY#a", "MEDIA_CATEGORY#b"]
+
+
 def test_createMedia_requires_auth():
     """POST /media without auth returns 401."""
     from api.handler import handler
@@ -140,6 +213,30 @@ def test_createMedia_success(mock_boto_client):
     assert body.get("title") == "My Photo"
 
 
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("api.handler.MEDIA_BUCKET", "media-bucket")
+@patch("boto3.client")
+def test_deleteMedia_deletes_item_then_both_objects_in_one_call(mock_boto_client):
+    """DELETE /media takes the S3 keys from delete_item's ALL_OLD and removes them with one DeleteObjects."""
+    from api.handler import handler
+    mock_client = MagicMock()
+    mock_client.delete_item.return_value = {"Attributes": {
+        "mediaKey": {"S": "media/videos/MEDIA#1/a.mp4"},
+        "thumbnailKey": {"S": "media/thumbnails/MEDIA#1.jpg"},
+    }}
+    mock_client.delete_objects.return_value = {}
+    mock_boto_client.return_value = mock_client
+
+    result = handler(_admin_event("/media", method="DELETE", body={"id": "MEDIA#1"}), None)
+
+    assert result["statusCode"] == 200
+    mock_client.get_item.assert_not_called()
+    assert mock_client.delete_item.call_args.kwargs["ReturnValues"] == "ALL_OLD"
+    assert mock_client.delete_objects.call_args.kwargs["Delete"]["Objects"] == [
+        {"Key": "media/thumbnails/MEDIA#1.jpg"}, {"Key": "media/videos/MEDIA#1/a.mp4"},
+    ]
+
+
 def test_mediaUpload_requires_auth():
     """POST /media/upload without auth returns 401."""
     from api.handler import handler
@@ -187,6 +284,25 @@ def test_mediaUpload_returns_url_and_key(mock_boto_client):
     assert body["key"].endswith(".png")
 
 
+@pytest.mark.parametrize("content_type,media_type,ext", [
+    ("image/jpeg", "image", "jpg"),
+    ("IMAGE/WEBP; charset=binary", "image", "webp"),
+    ("video/webm", "video", "webm"),
+    ("image/png+jpeg", "image", "png"),
+    ("video/x-unknown", "video", "mp4"),
+])
+@patch("api.handler.MEDIA_BUCKET", "test-media-bucket")
+@patch("boto3.client")
+def test_mediaUpload_key_extension_from_exact_content_type(mock_boto_client, content_type, media_type, ext):
+    from api.handler import handler
+    mock_boto_client.return_value.generate_presigned_url.return_value = "https://presigned.example/put"
+    event = _admin_event("/media/upload", body={
+        "mediaId": "MEDIA#xyz", "mediaType": media_type, "contentType": content_type,
+    })
+    body = json.loads(handler(event, None)["body"])
+    assert body["key"].endswith(f".{ext}")
+
+
 def test_setMediaStar_requires_auth():
     """POST /media/stars without auth returns 401."""
     from api.handler import handler
@@ -209,6 +325,51 @@ def test_setMediaStar_requires_mediaId():
     assert "mediaId" in result["body"]
 
 
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_setMediaStar_rerate_writes_star_and_aggregates_in_one_transaction(mock_boto_client):
+    """A media re-rate uses the same conditional star transaction as sites: no reads, delta only."""
+    from botocore.exceptions import ClientError
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.transact_write_items.side_effect = [
+        ClientError({
+            "Error": {"Code": "TransactionCanceledException"},
+            "CancellationReasons": [
+                {"Code": "ConditionalCheckFailed", "Item": {"rating": {"N": "2"}}}, {"Code": "None"},
+            ],
+        }, "TransactWriteItems"),
+        {},
+    ]
+    mock_boto_client.return_value = mock_dynamo
+
+    result = handler(_auth_event("/media/stars", body={"mediaId": "MEDIA#1", "rating": 5}), None)
+
+    assert result["statusCode"] == 200
+    assert not mock_dynamo.get_item.called and not mock_dynamo.batch_get_item.called
+    assert not mock_dynamo.update_item.called and not mock_dynamo.put_item.called
+    put, update = (next(iter(t.values())) for t in mock_dynamo.transact_write_items.call_args.kwargs["TransactItems"])
+    assert put["Item"]["entityType"] == {"S": "MEDIA_STAR"}
+    assert put["Item"]["SK"] == {"S": "STAR#user-123"}
+    assert update["ExpressionAttributeValues"][":sumDelta"] == {"N": "3"}
+    assert update["ExpressionAttributeValues"][":countDelta"] == {"N": "0"}
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_setMediaStar_missing_media_returns_404(mock_boto_client):
+    from botocore.exceptions import ClientError
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.transact_write_items.side_effect = ClientError({
+        "Error": {"Code": "TransactionCanceledException"},
+        "CancellationReasons": [{"Code": "None"}, {"Code": "ConditionalCheckFailed"}],
+    }, "TransactWriteItems")
+    mock_boto_client.return_value = mock_dynamo
+    result = handler(_auth_event("/media/stars", body={"mediaId": "MEDIA#gone", "rating": 3}), None)
+    assert result["statusCode"] == 404
+
+
 @patch("api.handler.TABLE_NAME", "fus-main")
 @patch("boto3.client")
 def test_listMediaCategories_public_returns_categories(mock_boto_client):
@@ -228,6 +389,38 @@ def test_listMediaCategories_public_returns_categories(mock_boto_client):
     assert "categories" in body
 
 
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_resolveCategoriesForMedia_caches_names_until_category_update(mock_boto_client):
+    """Media category names come from the warm-container cache; updateMediaCategory evicts its entry."""
+    from api.handler import _resolveCategoriesForMedia, handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.batch_get_item.return_value = {"Responses": {"fus-main": [
+        {"PK": {"S": "MEDIA_CATEGORY#1"}, "name": {"S": "Photos"}},
+    ]}}
+    mock_boto_client.return_value = mock_dynamo
+    for _ in range(2):
+        media = [{"categoryIds": ["MEDIA_CATEGORY#1"]}]
+        _resolveCategoriesForMedia(mock_dynamo, media)
+        assert media[0]["categories"] == [{"id": "MEDIA_CATEGORY#1", "name": "Photos"}]
+    assert mock_dynamo.batch_get_item.call_count == 1
+
+    handler(_admin_event("/media-categories", method="PUT", body={"id": "MEDIA_CATEGORY#1", "name": "Pics"}), None)
+    _resolveCategoriesForMedia(mock_dynamo, [{"categoryIds": ["MEDIA_CATEGORY#1"]}])
+    assert mock_dynamo.batch_get_item.call_count == 2
+
+
+def test_categoryNames_cache_is_bounded():
+    from api import handler as h
+    mock_dynamo = MagicMock()
+    mock_dynamo.batch_get_item.side_effect = lambda RequestItems: {"Responses": {"fus-main": [
+        {"PK": k["PK"], "name": {"S": "n"}} for k in RequestItems["fus-main"]["Keys"]
+    ]}}
+    with patch.object(h, "TABLE_NAME", "fus-main"), patch.object(h, "CATEGORY_CACHE_MAX", 3):
+        h._categoryNames(mock_dynamo, [f"MEDIA_CATEGORY#{i}" for i in range(5)])
+    assert list(h._categoryNameCache) == ["MEDIA_CATEGORY#2", "MEDIA_CATEGORY#3", "MEDIA_CATEGORY#4"]
+
+
 def test_createMediaCategory_requires_admin():
     """POST /media-categories with non-admin returns 403."""
     from api.handler import handler
@@ -303,3 +496,46 @@ def test_media_all_requires_admin():
     event["requestContext"]["http"]["path"] = "/media/all"
     result = handler(event, None)
     assert result["statusCode"] == 403
+
+
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_media_all_admin_walks_every_page(mock_boto_client):
+    """GET /media/all (admin) reads all byEntity pages via the paginator, without a Limit."""
+    from api.handler import handler
+    mock_dynamo = MagicMock()
+    mock_dynamo.get_paginator.return_value.paginate.return_value = iter([
+        {"Items": [{"PK": {"S": "MEDIA#1"}, "title": {"S": "B"}}]},
+        {"Items": [{"PK": {"S": "MEDIA#2"}, "title": {"S": "A"}}]},
+    ])
+    mock_boto_client.return_value = mock_dynamo
+    event = _admin_event("/media/all", method="GET")
+    event["body"] = None
+
+    result = handler(event, None)
+
+    assert result["statusCode"] == 200
+    assert [m["PK"] for m in json.loads(result["body"])["media"]] == ["MEDIA#2", "MEDIA#1"]
+    mock_dynamo.get_paginator.assert_called_once_with("query")
+    assert "Limit" not in mock_dynamo.get_paginator.return_value.paginate.call_args.kwargs
+    assert all(c.kwargs.get("IndexName") != "byEntity" for c in mock_dynamo.query.call_args_list)
+
+
+@patch("api.handler.MEDIA_BUCKET", "media-bucket")
+@patch("boto3.client")
+def test_addMediaUrls_signs_each_key_once_and_falls_back_to_image_url(mock_boto_client):
+    from api.handler import _addMediaUrls
+    mock_s3 = MagicMock()
+    mock_s3.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://signed/{Params['Key']}"
+    mock_boto_client.return_value = mock_s3
+    media = [
+        {"mediaKey": "media/images/a.png", "mediaType": "image"},
+        {"mediaKey": "media/videos/b.mp4", "thumbnailKey": "media/thumbnails/MEDIA#b.jpg", "mediaType": "video"},
+    ]
+    _addMediaUrls(media)
+    again = [{"mediaKey": "media/images/a.png", "mediaType": "image"}]
+    _addMediaUrls(again)
+    assert media[0]["thumbnailUrl"] == media[0]["mediaUrl"] == "https://signed/media/images/a.png"
+    assert media[1]["mediaUrl"] == "https://signed/media/videos/b.mp4" and "thumbnailUrl" not in media[1]
+    assert again[0]["mediaUrl"] == "https://signed/media/images/a.png"
+    assert mock_s3.generate_presigned_url.call_count == 2
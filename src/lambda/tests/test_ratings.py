@@ -0,0 +1,22 @@
+"""Unit tests for common.ratings."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.ratings import clampedAverage
+
+
+def test_clampedAverage_clamps_and_skips_unrated():
+    assert clampedAverage(7, 2) == 3.5
+    assert clampedAverage(0, 3) == 1.0
+    assert clampedAverage(30, 2) == 5.0
+    assert clampedAverage(0, 0) is None
+    assert clampedAverage(None, 2) is None
+    assert clampedAverage(4, None) is None
+
+
+def test_clampedAverage_ignores_non_numeric_aggregates():
+    assert clampedAverage("7", 2) is None
+    assert clampedAverage(7, "2") is None
+    assert clampedAverage(7, -1) is None
@@ -0,0 +1,59 @@
+"""Unit tests for common.response."""
+import base64
+import decimal
+import gzip
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common import response
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonResponse_serializes_decimals_and_int_keys(use_orjson):
+    if use_orjson and response.orjson is None:
+        pytest.skip("orjson not installed")
+    dumps = response._orjsonDumps if use_orjson else response._stdlibDumps
+    with patch.object(response, "jsonDumps", dumps):
+        result = response.jsonResponse({"n": decimal.Decimal("3"), "f": decimal.Decimal("2.5"), 1: "x"})
+    assert result["statusCode"] == 200
+    assert result["headers"]["Access-Control-Allow-Origin"] == "*"
+    assert json.loads(result["body"]) == {"n": 3, "f": 2.5, "1": "x"}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonLoads_invalid_body_raises_JSONDecodeError(use_orjson):
+    if use_orjson and response.orjson is None:
+        pytest.skip("orjson not installed")
+    loads = response.orjson.loads if use_orjson else json.loads
+    assert loads('{"a": [1, 2]}') == {"a": [1, 2]}
+    with pytest.raises(json.JSONDecodeError):
+        loads("{not json")
+
+
+def test_jsonResponse_passes_str_body_through():
+    assert response.jsonResponse('{"raw": 1}', 201)["body"] == '{"raw": 1}'
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_gzipJsonResponse_compresses_large_bodies_for_gzip_clients_only(use_orjson):
+    if use_orjson and response.orjson is None:
+        pytest.skip("orjson not installed")
+    dumps_bytes = response._orjsonDumpsBytes if use_orjson else response._stdlibDumpsBytes
+    big = {"sites": [{"title": "x" * 50, "n": decimal.Decimal("2")}] * 40}
+    gz_event = {"headers": {"accept-encoding": "gzip, deflate, br"}}
+    with patch.object(response, "jsonDumpsBytes", dumps_bytes):
+        plain = response.gzipJsonResponse(big, {"headers": {}})
+        small = response.gzipJsonResponse({"ok": True}, gz_event)
+        out = response.gzipJsonResponse(big, gz_event)
+    assert "isBase64Encoded" not in plain and json.loads(plain["body"]) == json.loads(json.dumps(big, default=int))
+    assert json.loads(small["body"]) == {"ok": True}
+    assert out["isBase64Encoded"] is True
+    assert out["headers"]["Content-Encoding"] == "gzip"
+    assert plain["headers"]["Vary"] == small["headers"]["Vary"] == out["headers"]["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(base64.b64decode(out["body"])).decode() == plain["body"]
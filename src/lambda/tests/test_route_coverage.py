@@ -1,7 +1,9 @@
 """Guard against API handler / API Gateway route drift.
 
 Routes are maintained in TWO places that must agree:
-  1. dispatch in a handler module (`method == "X" and path == "/y"`)
+  1. dispatch in a handler module (`method == "X" and path == "/y"`, or a
+     `("X", "/y"): fn` entry in a route table such as api/handler.py's
+     `_ROUTES`)
   2. `aws_apigatewayv2_route` resources somewhere in `infra/*.tf`
      (`route_key = "X /y"`)
 
@@ -11,8 +13,10 @@ CORS headers, surfacing in the browser as a misleading "Failed to fetch"
 literal routes from every known handler and fails if a handler declares one
 the gateway doesn't expose.
 
-Best-effort by design: only literal `path == "..."` dispatches are checked.
-Dynamic routes (`path.startswith(...)`, path params) can't be matched
+Best-effort by design: only literal `path == "..."` dispatches and route-table
+entries are checked. Table entries may carry `{param}` segments (api/handler.py's
+`_PARAM_ROUTES`), which must then match the gateway route_key exactly, parameter
+names included. Prefix dispatches (`path.startswith(...)`) can't be matched
 statically and are skipped — see each handler's entry in HANDLERS for paths
 that map to a parameterised gateway route.
 
@@ -51,6 +55,9 @@ def _handler_routes(handler_path: Path) -> set[tuple[str, str]]:
         m_path = re.search(r'path == "(/[^"]*)"', line)
         if m_method and m_path:
             routes.add((m_method.group(1), m_path.group(1)))
+        m_entry = re.match(r'\s*\("(\w+)", "(/[^"]*)"\):', line)
+        if m_entry:
+            routes.add((m_entry.group(1), m_entry.group(2)))
     return routes
 
 
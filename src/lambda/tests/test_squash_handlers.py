@@ -252,6 +252,56 @@ def test_listSquashMatches_returns_matches(mock_boto, mock_custom_groups):
     assert "matches" in body
 
 
+@patch("api.handler._getUserCustomGroups", return_value=["Squash"])
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_listSquashMatches_playerIds_and_mode_intersects_per_player_matches(mock_boto, mock_custom_groups):
+    """GET /squash/matches?playerIds=a,b (and) returns only matches both players appear in."""
+    from api.handler import handler
+    player_matches = {
+        "SQUASH#PLAYER#a": ["MATCH#m1", "MATCH#m2"],
+        "SQUASH#PLAYER#b": ["MATCH#m2", "MATCH#m3"],
+    }
+
+    def query(**kw):
+        if kw.get("IndexName") == "byEntity":
+            return {"Items": [{"PK": {"S": f"SQUASH#MATCH#m{i}"}} for i in (1, 2, 3)]}
+        pk = kw["ExpressionAttributeValues"][":pk"]["S"]
+        return {"Items": [{"SK": {"S": sk}} for sk in player_matches.get(pk, [])]}
+
+    mock_dynamo = MagicMock()
+    mock_dynamo.query.side_effect = query
+    mock_dynamo.batch_get_item.side_effect = lambda RequestItems: {"Responses": {"fus-main": [
+        {**key, "date": {"S": "2026-01-01"}} for key in RequestItems["fus-main"]["Keys"]
+    ]}}
+    mock_boto.return_value = mock_dynamo
+    event = _admin_event("/squash/matches")
+    event["queryStringParameters"] = {"playerIds": "a,b", "playerMode": "and"}
+    result = handler(event, None)
+    assert result["statusCode"] == 200
+    assert [m["id"] for m in json.loads(result["body"])["matches"]] == ["m2"]
+
+
+@patch("api.handler._getUserCustomGroups", return_value=["Squash"])
+@patch("api.handler.TABLE_NAME", "fus-main")
+@patch("boto3.client")
+def test_listSquashMatches_returns_503_when_batch_get_stays_throttled(mock_boto, mock_custom_groups):
+    """Match keys still unprocessed after every retry give a 503, not a 200 with matches missing."""
+    from api import handler as h
+    mock_dynamo = MagicMock()
+    mock_dynamo.query.return_value = {"Items": [{"PK": {"S": "SQUASH#MATCH#m1"}}, {"PK": {"S": "SQUASH#MATCH#m2"}}]}
+    key2 = {"PK": {"S": "SQUASH#MATCH#m2"}, "SK": {"S": "METADATA"}}
+    mock_dynamo.batch_get_item.return_value = {
+        "Responses": {"fus-main": [{"PK": {"S": "SQUASH#MATCH#m1"}, "date": {"S": "2026-01-01"}}]},
+        "UnprocessedKeys": {"fus-main": {"Keys": [key2]}},
+    }
+    mock_boto.return_value = mock_dynamo
+    with patch.object(h.time, "sleep"):
+        result = h.handler(_admin_event("/squash/matches"), None)
+    assert result["statusCode"] == 503
+    assert mock_dynamo.batch_get_item.call_count == h.BATCH_GET_MAX_ATTEMPTS
+
+
 @patch("api.handler._getUserCustomGroups", return_value=["Squash"])
 @patch("api.handler.TABLE_NAME", "fus-main")
 @patch("boto3.client")
@@ -0,0 +1,16 @@
+"""Unit tests for common.timestamps."""
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.timestamps import isoNow
+
+
+def test_isoNow_is_utc_microsecond_iso_with_z():
+    before = datetime.now(timezone.utc).replace(tzinfo=None)
+    stamp = isoNow()
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}Z", stamp)
+    assert abs((datetime.fromisoformat(stamp[:-1]) - before).total_seconds()) < 5
@@ -445,3 +445,30 @@ def test_export_all_zip_contains_csvs_and_all_attachments():
     assert "maintenance.csv" in names
     assert any(name.endswith("/a.pdf") for name in names)
     assert any(name.endswith("/b.pdf") for name in names)
+
+
+@patch("api.vehicles_expenses.create_vehicle", return_value={"id": "v2", "name": "Van"})
+@patch("api.vehicles_expenses.list_vehicles", return_value=[{"id": "v1", "name": "Car"}])
+def test_build_fuel_import_items_validates_like_import(mock_list, mock_create):
+    from api.vehicles_expenses import build_fuel_import_items
+    items, errors = build_fuel_import_items("u1", [
+        {"vehicleName": "Car", "entries": [
+            {"date": 45292, "fuelPrice": "65.5", "fuelLitres": 40, "odometerKm": 1000},
+            {"date": "2024-02-01", "fuelPrice": "abc"},
+            {},
+        ]},
+        {"vehicleName": "Van", "entries": [{"date": "2024-03-05T10:00", "fuelLitres": 10}]},
+        {"vehicleName": "", "entries": []},
+    ])
+    assert len(items) == 2
+    assert items[0]["PK"] == {"S": "USER#u1"}
+    assert items[0]["SK"]["S"].startswith("VEHICLE#v1#FUEL#")
+    assert items[0]["date"] == {"S": "2024-01-01"}
+    assert items[0]["fuelPrice"] == {"N": "65.5"}
+    assert items[0]["createdAt"]["S"].endswith("Z")
+    assert items[1]["SK"]["S"].startswith("VEHICLE#v2#FUEL#")
+    assert items[1]["date"] == {"S": "2024-03-05"}
+    assert len(errors) == 2
+    assert errors[0].startswith("Invalid numbers in entry for Car")
+    assert errors[1] == "Missing vehicleName in import"
+    mock_create.assert_called_once_with("u1", {"name": "Van"})
@@ -36,29 +36,13 @@ import os
 import re
 import secrets
 import string
-import sys
 import time
-from datetime import datetime, timezone
-from pathlib import Path
 from urllib.parse import urlparse
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-from botocore.exceptions import ClientError  # noqa: E402
-
-try:
-    from common.response import jsonResponse
-except ImportError:
-    # Fallback if import fails (mirrors api/handler.py's defensive import)
-    def jsonResponse(body, statusCode=200):
-        return {
-            "statusCode": statusCode,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-            },
-            "body": json.dumps(body) if not isinstance(body, str) else body,
-        }
+from botocore.exceptions import ClientError
+
+from common.response import jsonResponse
+from common.timestamps import isoNow
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -104,10 +88,6 @@ def _kvsClient():
     return _kvs
 
 
-def _now():
-    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
-
-
 def _nowEpoch():
     return int(time.time())
 
@@ -247,7 +227,7 @@ def mintShortLink(event):
 
     created_by = _getSub(event)
     created_host = _getCreatedHost(event)
-    created_at = _now()
+    created_at = isoNow()
     expires_at = _nowEpoch() + LINK_TTL_DAYS * 86400
 
     code = _mintCode(url, created_by, created_host, expires_at, created_at)
@@ -630,7 +610,7 @@ def mintTextPaste(event):
         return jsonResponse({"error": err}, 400)
 
     created_by = _getSub(event)
-    created_at = _now()
+    created_at = isoNow()
     expires_at = _nowEpoch() + expires_in
     text_id = secrets.token_urlsafe(16)  # 128-bit, unguessable — public GET has no auth gate
 